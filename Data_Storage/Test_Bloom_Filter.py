@@ -0,0 +1,79 @@
+import pytest
+from bloom_filter import BloomFilter
+
+
+def test_add_many_read_only(tmp_path):
+    path = tmp_path / "filter.bloom"
+    bloom_filter = BloomFilter(size=1000, number_of_hash_functions=3)
+    bloom_filter.add_many(["nee", "vee", "wowzers"])
+    bloom_filter.save(path)
+
+    with BloomFilter.open(path) as mapped:
+        with pytest.raises(TypeError):
+            mapped.add_string("gilu")
+        with pytest.raises(TypeError):
+            mapped.add_many(["gilu", "nisu"])
+        with pytest.raises(TypeError):
+            mapped |= bloom_filter
+        assert list(mapped.contains_many(["nee", "vee", "wowzers"])) == [True, True, True]
+
+
+def test_combine():
+    first, second = BloomFilter(size=500, number_of_hash_functions=3), BloomFilter(size=500, number_of_hash_functions=3)
+    first.add_many(["nee", "vee"])
+    second.add_many(["gilu", "nisu"])
+    both = first | second
+    assert all(both.check_membership(s) for s in ["nee", "vee", "gilu", "nisu"])
+    assert (first & second).popcount() <= min(first.popcount(), second.popcount())
+
+    with pytest.raises(ValueError):
+        first | BloomFilter(size=501, number_of_hash_functions=3)
+    with pytest.raises(ValueError):
+        first & BloomFilter(size=500, number_of_hash_functions=3, backend="list")
+
+
+@pytest.mark.parametrize("hash_scheme", ["prime", "double", "blocked"])
+def test_add_many_bytes(hash_scheme):
+    pytest.importorskip("numpy")
+    strings = [b"\xff\xfe", "nee", bytearray(b"v\x00e"), memoryview(b"\x80" * 70), "€\U0001F600"]
+    scalar = BloomFilter(size=2000, number_of_hash_functions=3, hash_scheme=hash_scheme)
+    batch = BloomFilter(size=2000, number_of_hash_functions=3, hash_scheme=hash_scheme)
+    for s in strings:
+        scalar.add_string(s)
+    batch.add_many(strings)
+
+    assert batch.bit_array == scalar.bit_array
+    assert list(batch.contains_many(strings)) == [True] * len(strings)
+
+
+@pytest.mark.parametrize("hash_scheme", ["prime", "double", "blocked"])
+def test_save_open(tmp_path, hash_scheme):
+    path = tmp_path / "filter.bloom"
+    strings = ["s" + str(i) for i in range(300)]
+    bloom_filter = BloomFilter(size=3000, number_of_hash_functions=4, hash_scheme=hash_scheme, seed=31)
+    bloom_filter.add_many(strings)
+    bloom_filter.save(path)
+
+    with BloomFilter.open(path) as mapped:
+        assert (mapped.size, mapped.number_of_hash_functions, mapped.hash_scheme, mapped.seed) == \
+               (bloom_filter.size, 4, hash_scheme, 31)
+        assert bytes(mapped.bit_array) == bytes(bloom_filter.bit_array)
+        assert all(mapped.check_membership(s) for s in strings)
+        assert mapped.memory_usage() == (bloom_filter.size + 7) // 8
+
+    with BloomFilter.open(path, mode="r+") as mapped:
+        mapped.add_string("nee")
+    with BloomFilter.open(path) as mapped:
+        assert mapped.check_membership("nee")
+
+
+@pytest.mark.parametrize("hash_scheme", ["prime", "double", "blocked"])
+def test_backends(hash_scheme):
+    packed = BloomFilter(size=1001, number_of_hash_functions=3, hash_scheme=hash_scheme)
+    as_list = BloomFilter(size=1001, number_of_hash_functions=3, backend="list", hash_scheme=hash_scheme)
+    for i in range(100):
+        packed.add_string("s" + str(i))
+        as_list.add_string("s" + str(i))
+
+    assert [packed._get_bit(i) for i in range(packed.size)] == as_list.bit_array
+    assert packed.popcount() == as_list.popcount()
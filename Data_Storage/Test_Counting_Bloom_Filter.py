@@ -0,0 +1,77 @@
+import pytest
+from counting_bloom_filter import CountingBloomFilter, COUNTER_MAX
+
+
+def _repeating_string(counting_filter):
+    """
+    A string that hashes twice to the same counter (and to one other counter)
+    """
+    for i in range(10000):
+        s = "s" + str(i)
+        indices = list(counting_filter._iter_indices(s))
+        if len(set(indices)) == len(indices) - 1:
+            return s, indices
+
+
+def test_overflow_raise():
+    counting_filter = CountingBloomFilter(size=50, number_of_hash_functions=3, overflow="raise")
+    s, indices = _repeating_string(counting_filter)
+    repeated = max(indices, key=indices.count)
+
+    for _ in range(COUNTER_MAX // 2):
+        counting_filter.add_string(s)
+    assert counting_filter._get_counter(repeated) == COUNTER_MAX - 1
+
+    # one more add would take the repeated counter to COUNTER_MAX + 1, so nothing may change
+    counters = bytes(counting_filter.counters)
+    with pytest.raises(OverflowError):
+        counting_filter.add_string(s)
+    assert bytes(counting_filter.counters) == counters
+
+
+def test_overflow_saturate():
+    counting_filter = CountingBloomFilter(size=50, number_of_hash_functions=3)
+    s, indices = _repeating_string(counting_filter)
+    repeated = max(indices, key=indices.count)
+    single = min(indices, key=indices.count)
+
+    for _ in range(COUNTER_MAX // 2 + 1):
+        counting_filter.add_string(s)
+    assert counting_filter._get_counter(repeated) == COUNTER_MAX
+    assert counting_filter._get_counter(single) == COUNTER_MAX // 2 + 1
+
+    # the saturated counter lost its real count and is never decremented
+    assert counting_filter.remove_string(s)
+    assert counting_filter._get_counter(repeated) == COUNTER_MAX
+    assert counting_filter._get_counter(single) == COUNTER_MAX // 2
+    while counting_filter.remove_string(s):
+        pass
+    assert counting_filter._get_counter(repeated) == COUNTER_MAX
+    assert counting_filter._get_counter(single) == 0
+    assert not counting_filter.check_membership(s)
+
+
+def test_remove():
+    counting_filter = CountingBloomFilter(size=200, number_of_hash_functions=3, hash_scheme="double")
+    counting_filter.add_many(["nee", "vee", "gilu"])
+    assert counting_filter.remove_string("gilu")
+    assert not counting_filter.check_membership("gilu")
+    assert list(counting_filter.contains_many(["nee", "vee"])) == [True, True]
+    assert not counting_filter.remove_string("gilu")
+
+
+def test_bit_filter_operations(tmp_path):
+    counting_filter = CountingBloomFilter(size=200, number_of_hash_functions=3)
+    counting_filter.add_string("nee")
+    copied = counting_filter.copy()
+    copied.add_string("vee")
+    assert copied.count_estimate("vee") == 1 and counting_filter.popcount() < copied.popcount()
+
+    with pytest.raises(TypeError):
+        counting_filter | copied
+    with pytest.raises(TypeError):
+        counting_filter &= copied
+    with pytest.raises(TypeError):
+        counting_filter.save(tmp_path / "counting.bloom")
+    with pytest.raises(TypeError):
+        CountingBloomFilter.open(tmp_path / "counting.bloom")
@@ -0,0 +1,80 @@
+import io
+import pytest
+import random
+from hash_functions import *
+
+
+@pytest.mark.parametrize("length", [0, 1, HASH_CHUNK_SIZE - 1, HASH_CHUNK_SIZE, HASH_CHUNK_SIZE + 1, 3 * HASH_CHUNK_SIZE + 5])
+def test_bytes_hash(length):
+    rng = random.Random(length)
+    s = "".join(chr(rng.randint(0, 255)) for _ in range(length))
+    data = s.encode("latin-1")
+
+    assert compute_string_hash(data) == compute_string_hash(s)
+    assert compute_string_hash(bytearray(data), p=31, m=2**31 - 1) == compute_string_hash(s, p=31, m=2**31 - 1)
+    assert compute_file_hash(io.BytesIO(data), chunk_size=1000) == compute_string_hash(s)
+
+    hasher = PolynomialHasher()
+    hasher.update(data[:length // 3]).update(s[length // 3:])
+    assert hasher.digest() == compute_string_hash(s)
+
+
+@pytest.mark.parametrize("p, m", [(53, 10**9 + 9), (31, 2**31 - 1), (31, 2**61 - 1)])
+def test_batch_hash(p, m):
+    pytest.importorskip("numpy")
+    rng = random.Random(p)
+    strings = ["".join(chr(rng.choice([97, 0x3b1, 0x1F600, 0xdc5f])) for _ in range(rng.choice([0, 1, 3, 17, 300])))
+               for _ in range(300)] + ["x" * 20000, b"\xff\xfe", bytearray(b"ab\x00"), "\udc5f" + "a" * 20]
+    rng.shuffle(strings)
+    assert list(compute_string_hashes(strings, p, m)) == [compute_string_hash(s, p, m) for s in strings]
+    assert len(compute_string_hashes([], p, m)) == 0
+
+    # a group is padded to at most twice the length of its shortest string
+    _, groups = encode_strings(strings)
+    for indices, codes in groups:
+        assert codes.shape[1] <= 2 * max(min(len(strings[i]) for i in indices), 1)
+
+
+def _brute_force_duplicates(text, length):
+    positions = {}
+    for start in range(len(text) - length + 1):
+        positions.setdefault(text[start:start + length], []).append(start)
+    return {substring: starts for substring, starts in positions.items() if len(starts) > 1}
+
+
+def _brute_force_longest_repeat(text):
+    for length in range(len(text) - 1, 0, -1):
+        duplicates = _brute_force_duplicates(text, length)
+        if duplicates:
+            return min(duplicates, key=lambda substring: duplicates[substring][0])
+    return text[:0]
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_rolling_hash_index(as_bytes):
+    rng = random.Random(9)
+    for _ in range(30):
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 40)))
+        text = text.encode() if as_bytes else text
+        index = RollingHashIndex(text)
+
+        for start in range(len(text) + 1):
+            for end in range(start, len(text) + 1):
+                assert index.substring_hash(start, end) == tuple(compute_string_hash(text[start:end], 53, m)
+                                                                 for m in index.moduli)
+
+        patterns = list({text[start:start + length] for start in range(len(text)) for length in (1, 2, 5)})
+        patterns += [text[:0], "abcabcabca".encode() if as_bytes else "abcabcabca", text + text[:1]]
+        occurrences = index.find_all(patterns)
+        for pattern in patterns:
+            expected = [start for start in range(len(text) - len(pattern) + 1)
+                        if text[start:start + len(pattern)] == pattern] if pattern else []
+            assert occurrences[pattern] == expected
+            assert index.find(pattern) == expected
+
+        for length in range(1, 8):
+            assert index.duplicate_substrings(length) == _brute_force_duplicates(text, length)
+
+        longest = index.longest_repeated_substring()
+        assert longest == _brute_force_longest_repeat(text)
+        assert type(longest) is type(text)
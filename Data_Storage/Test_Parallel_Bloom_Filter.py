@@ -0,0 +1,16 @@
+import pytest
+from bloom_filter import BloomFilter
+from parallel_bloom_filter import build_bloom_filter_parallel
+
+
+@pytest.mark.parametrize("hash_scheme", ["prime", "double", "blocked"])
+@pytest.mark.parametrize("size", [10000, 4096])
+def test_parallel_build(hash_scheme, size):
+    strings = ["string" + str(i) for i in range(3000)]
+    parallel_filter = build_bloom_filter_parallel(strings, size=size, number_of_hash_functions=3,
+                                                  hash_scheme=hash_scheme, workers=2)
+    single_filter = BloomFilter(size=size, number_of_hash_functions=3, hash_scheme=hash_scheme)
+    single_filter.add_many(strings)
+
+    assert parallel_filter.size == single_filter.size
+    assert parallel_filter.bit_array == single_filter.bit_array
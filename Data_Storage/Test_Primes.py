@@ -0,0 +1,14 @@
+import random
+from primes import is_prime, next_prime, prime_range
+
+
+def test_is_prime():
+    def trial_division(n):
+        return n > 1 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+    assert [n for n in range(2000) if is_prime(n)] == [n for n in range(2000) if trial_division(n)]
+    rng = random.Random(0)
+    for n in (rng.randint(10**6, 10**9) for _ in range(200)):
+        assert is_prime(n) == trial_division(n)
+    assert prime_range(0, 2000) == [n for n in range(2000) if trial_division(n)]
+    assert next_prime(10**9) == 10**9 + 7
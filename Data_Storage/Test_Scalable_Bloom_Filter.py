@@ -0,0 +1,35 @@
+import pytest
+from scalable_bloom_filter import ScalableBloomFilter
+
+
+@pytest.mark.parametrize("growth_factor", [2, 3])
+def test_growth(growth_factor):
+    scalable_filter = ScalableBloomFilter(initial_capacity=100, false_positive_rate=0.01, growth_factor=growth_factor)
+    strings = ["string" + str(i) for i in range(3000)]
+    for s in strings:
+        scalable_filter.add_string(s)
+
+    assert len(scalable_filter.filters) >= 4
+    assert scalable_filter.capacities == [100 * growth_factor**i for i in range(len(scalable_filter.filters))]
+    assert all(count <= capacity for count, capacity in zip(scalable_filter.counts, scalable_filter.capacities))
+    assert all(count == capacity for count, capacity in zip(scalable_filter.counts[:-1], scalable_filter.capacities))
+    assert len(scalable_filter) == sum(scalable_filter.counts) <= len(strings)
+
+    # no false negatives, whichever sub-filter a string went to
+    assert all(scalable_filter.check_membership(s) for s in strings)
+    assert not scalable_filter.add_string(strings[0])
+
+
+@pytest.mark.parametrize("hash_scheme", ["double", "prime"])
+@pytest.mark.parametrize("false_positive_rate", [0.01, 0.05])
+def test_false_positive_rate(hash_scheme, false_positive_rate):
+    scalable_filter = ScalableBloomFilter(initial_capacity=100, false_positive_rate=false_positive_rate,
+                                          hash_scheme=hash_scheme)
+    scalable_filter.add_many(["string" + str(i) for i in range(10000)])
+    assert len(scalable_filter.filters) >= 6
+
+    queries = ["other" + str(i) for i in range(20000)]
+    measured = sum(scalable_filter.check_membership(s) for s in queries) / len(queries)
+    # the bound is reached once every sub-filter is full, the slack covers sampling noise and rounding of the sizes
+    assert measured <= 1.15 * false_positive_rate
+    assert measured == pytest.approx(scalable_filter.expected_false_positive_rate(), rel=0.15)
@@ -0,0 +1,248 @@
+from bloom_filter import BloomFilter, get_optim_bloom_filter_size, get_optim_num_of_hash_functs
+from counting_bloom_filter import CountingBloomFilter
+from parallel_bloom_filter import build_bloom_filter_parallel
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+"""
+Benchmarks for the Bloom Filter implementations in this folder.
+
+Usage:
+    python bench_bloom_filter.py [benchmark name ...]
+
+With no arguments every benchmark is run.
+"""
+
+
+def random_strings(count, length=12, seed=0):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    return ["".join(rng.choice(alphabet) for _ in range(length)) for _ in range(count)]
+
+
+def ops_per_sec(function, items):
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def bench_memory():
+    """
+    Compares the bytes needed by the list and packed backends for filters sized by
+    get_optim_bloom_filter_size.
+    """
+    print("== memory: list vs packed backend ==")
+    for n in (10_000, 100_000, 1_000_000):
+        size = get_optim_bloom_filter_size(n, desired_false_positive_rate=0.01)
+        k = get_optim_num_of_hash_functs(size, n)
+        as_list = BloomFilter(size, k, backend="list").memory_usage()
+        packed = BloomFilter(size, k, backend="packed").memory_usage()
+        print(f"n={n:>9,} bits={size:>11,} list={as_list / 2**20:9.2f} MiB "
+              f"packed={packed / 2**20:7.3f} MiB  ratio={as_list / packed:5.1f}x")
+
+
+def bench_throughput():
+    """
+    Compares add_string / check_membership speed of the two backends.
+    """
+    print("== throughput: list vs packed backend ==")
+    n = 20_000
+    keys = random_strings(n)
+    others = random_strings(n, seed=1)
+    size = get_optim_bloom_filter_size(n, desired_false_positive_rate=0.01)
+    k = get_optim_num_of_hash_functs(size, n)
+    for backend in ("list", "packed"):
+        bloom_filter = BloomFilter(size, k, backend=backend)
+        add_rate = ops_per_sec(bloom_filter.add_string, keys)
+        check_rate = ops_per_sec(bloom_filter.check_membership, others)
+        print(f"{backend:>6}: add {add_rate:10,.0f} ops/s  check {check_rate:10,.0f} ops/s  "
+              f"fill ratio {bloom_filter.fill_ratio():.3f}")
+
+
+def bench_hash_schemes():
+    """
+    Compares the per-prime "prime" scheme against "double" hashing for growing k and key length,
+    together with the false positive rate each scheme reaches.
+    """
+    print("== hash schemes: prime vs double ==")
+    n = 5_000
+    for length in (12, 64):
+        keys = random_strings(n, length=length)
+        others = random_strings(n, length=length, seed=1)
+        for k in (4, 10):
+            size = 10 * n
+            for scheme in ("prime", "double"):
+                bloom_filter = BloomFilter(size, k, hash_scheme=scheme)
+                add_rate = ops_per_sec(bloom_filter.add_string, keys)
+                check_rate = ops_per_sec(bloom_filter.check_membership, keys)
+                false_positives = sum(bloom_filter.check_membership(s) for s in others) / n
+                print(f"len={length:>3} k={k:>2} {scheme:>6}: add {add_rate:9,.0f} ops/s  "
+                      f"check (hits) {check_rate:9,.0f} ops/s  fp rate {false_positives:.4f}")
+
+
+def bench_batch():
+    """
+    Compares the scalar add_string / check_membership loop against add_many / contains_many.
+    """
+    print("== batch: scalar loop vs add_many / contains_many ==")
+    n = 200_000
+    keys = random_strings(n)
+    others = random_strings(n, seed=1)
+    size = get_optim_bloom_filter_size(n, desired_false_positive_rate=0.01)
+    k = get_optim_num_of_hash_functs(size, n)
+    for scheme in ("prime", "double"):
+        scalar = BloomFilter(size, k, hash_scheme=scheme)
+        add_rate = ops_per_sec(scalar.add_string, keys)
+        check_rate = ops_per_sec(scalar.check_membership, others)
+
+        batch = BloomFilter(size, k, hash_scheme=scheme)
+        start = time.perf_counter()
+        batch.add_many(keys)
+        batch_add_rate = n / (time.perf_counter() - start)
+        start = time.perf_counter()
+        batch.contains_many(others)
+        batch_check_rate = n / (time.perf_counter() - start)
+
+        assert scalar.bit_array == batch.bit_array
+        print(f"{scheme:>6}: add {add_rate:10,.0f} -> {batch_add_rate:12,.0f} ops/s ({batch_add_rate / add_rate:5.1f}x)  "
+              f"check {check_rate:10,.0f} -> {batch_check_rate:12,.0f} ops/s ({batch_check_rate / check_rate:5.1f}x)")
+
+
+def bench_mmap():
+    """
+    Measures how long BloomFilter.open takes on a large saved filter compared with building it,
+    and the lookup rate straight from the memory mapping.
+    """
+    print("== mmap: open a saved filter ==")
+    n = 100_000
+    keys = random_strings(n)
+    size = 2**31  # 256 MiB of bits
+    bloom_filter = BloomFilter(size, 7, hash_scheme="double")
+    bloom_filter.add_many(keys)
+
+    path = os.path.join(tempfile.mkdtemp(), "filter.bloom")
+    start = time.perf_counter()
+    bloom_filter.save(path)
+    save_time = time.perf_counter() - start
+    del bloom_filter
+
+    start = time.perf_counter()
+    mapped = BloomFilter.open(path)
+    open_time = time.perf_counter() - start
+    check_rate = ops_per_sec(mapped.check_membership, keys[:20_000])
+    assert mapped.contains_many(keys).all()
+    mapped.close()
+    os.remove(path)
+
+    print(f"{size // 8 / 2**20:.0f} MiB filter: save {save_time:.2f} s  open {open_time * 1000:.3f} ms  "
+          f"check from mapping {check_rate:,.0f} ops/s")
+
+
+def bench_counting():
+    """
+    Compares memory and speed of the counting filter against the list and packed bit filters.
+    """
+    print("== counting: list vs packed vs 4-bit counters ==")
+    n = 20_000
+    keys = random_strings(n)
+    others = random_strings(n, seed=1)
+    size = get_optim_bloom_filter_size(n, desired_false_positive_rate=0.01)
+    k = get_optim_num_of_hash_functs(size, n)
+    filters = {
+        "list": BloomFilter(size, k, backend="list"),
+        "packed": BloomFilter(size, k),
+        "counting": CountingBloomFilter(size, k),
+    }
+    for name, bloom_filter in filters.items():
+        add_rate = ops_per_sec(bloom_filter.add_string, keys)
+        check_rate = ops_per_sec(bloom_filter.check_membership, others)
+        line = (f"{name:>8}: {bloom_filter.memory_usage() / 2**10:8.1f} KiB  add {add_rate:9,.0f} ops/s  "
+                f"check {check_rate:9,.0f} ops/s")
+        if name == "counting":
+            remove_rate = ops_per_sec(bloom_filter.remove_string, keys)
+            line += f"  remove {remove_rate:9,.0f} ops/s  (non-zero after removing all: {bloom_filter.popcount()})"
+        print(line)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def bench_blocked():
+    """
+    Compares the classic ("double") layout against the cache-line "blocked" layout at equal memory:
+    p50 / p99 latency of single lookups, batched lookup cost and the false positive rate.
+    The filter is made much larger than the CPU caches so that the random accesses of the classic
+    layout miss.
+    """
+    print("== blocked: classic vs cache-line blocked layout ==")
+    n = 1_000_000
+    keys = random_strings(n)
+    others = random_strings(200_000, seed=1)
+    for bits_per_key in (8, 16, 32):
+        size = n * bits_per_key
+        k = get_optim_num_of_hash_functs(size, n)
+        for scheme in ("double", "blocked"):
+            bloom_filter = BloomFilter(size, k, hash_scheme=scheme)
+            bloom_filter.add_many(keys)
+
+            latencies = []
+            for s in others[:50_000]:
+                start = time.perf_counter_ns()
+                bloom_filter.check_membership(s)
+                latencies.append(time.perf_counter_ns() - start)
+            latencies.sort()
+
+            start = time.perf_counter()
+            false_positives = bloom_filter.contains_many(others).mean()
+            batch_ns = (time.perf_counter() - start) * 1e9 / len(others)
+
+            print(f"bits/key={bits_per_key:>2} k={k:>2} {scheme:>7}: p50 {percentile(latencies, 0.5):6,} ns  "
+                  f"p99 {percentile(latencies, 0.99):6,} ns  batched {batch_ns:6.0f} ns/lookup  "
+                  f"fp rate {false_positives:.4f}")
+
+
+def bench_parallel():
+    """
+    Build time of build_bloom_filter_parallel for growing worker counts (bounded by the CPU count).
+    """
+    print(f"== parallel build ({os.cpu_count()} CPUs) ==")
+    n = 1_000_000
+    keys = random_strings(n)
+    size = get_optim_bloom_filter_size(n, desired_false_positive_rate=0.01)
+    k = get_optim_num_of_hash_functs(size, n)
+
+    start = time.perf_counter()
+    single = BloomFilter(size, k, hash_scheme="double")
+    single.add_many(keys)
+    single_time = time.perf_counter() - start
+    print(f"single process add_many: {single_time:6.2f} s")
+
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        parallel = build_bloom_filter_parallel(keys, size, k, workers=workers)
+        parallel_time = time.perf_counter() - start
+        assert parallel.bit_array == single.bit_array
+        print(f"{workers} workers: {parallel_time:6.2f} s  speedup {single_time / parallel_time:4.2f}x")
+
+
+BENCHMARKS = {
+    "memory": bench_memory,
+    "throughput": bench_throughput,
+    "hash_schemes": bench_hash_schemes,
+    "batch": bench_batch,
+    "mmap": bench_mmap,
+    "counting": bench_counting,
+    "blocked": bench_blocked,
+    "parallel": bench_parallel,
+}
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -1,6 +1,15 @@
-from hash_functions import compute_string_hash
-from helper import _gen_next_prime
+from hash_functions import compute_string_hash, compute_encoded_hashes, encode_strings, mix64
+from primes import primes_from
+from itertools import islice
 import math
+import mmap
+import struct
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # add_many / contains_many fall back to the scalar path without numpy
+    np = None
 
 """
 This file contains implementation of creating a bloom filter of a given size.
@@ -9,42 +18,422 @@ Moreover, you can find a method that can determine the optimal size of your filt
 relevant parameters.
 """
 
+def _batched(iterable, batch_size):
+    """
+    Splits an iterable into lists of at most batch_size items.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+# modulus used for the two base hashes of the "double" and "blocked" hashing schemes
+DOUBLE_HASH_MODULUS = 2**31 - 1
+
+# the "blocked" scheme keeps all k bits of a string inside one 64-byte (cache line sized) block
+BLOCK_BITS = 512
+
+# On-disk format: a fixed 64 byte header followed by the packed bit array (same layout as in memory)
+#   magic (8s) | version (B) | size in bits (Q) | number of hash functions (I) | hash scheme (B) | seed (Q)
+FILE_MAGIC = b"PAVEBLOM"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<8sBQIBQ")
+FILE_HEADER_SIZE = 64  # header is zero padded so the bit region starts on a cache line
+HASH_SCHEMES = ("prime", "double", "blocked")  # position in this tuple is the scheme id stored in the header
+
+
 class BloomFilter:
-    def __init__(self, size=1000, number_of_hash_functions=1):
+    # backends accepted by the constructor, a subclass with its own storage overrides this and _allocate
+    BACKENDS = ("packed", "list")
+
+    def __init__(self, size=1000, number_of_hash_functions=1, backend="packed", hash_scheme="prime", seed=53,
+                 buffer=None):
+        """
+        :param size: number of bits in the filter
+        :param number_of_hash_functions: number of bits set per inserted string
+        :param backend: "packed" stores 8 bits per byte in a bytearray,
+                        "list" keeps the original one-int-per-bit Python list
+        :param hash_scheme: "prime" hashes the string once per hash function, each time with the next prime p,
+                            "double" derives all k indices from two base hashes (Kirsch-Mitzenmacher h1 + i*h2)
+                            "blocked" picks one 512-bit block per string and sets all k bits inside it, so a
+                            lookup touches a single cache line (size is rounded up to whole blocks)
+        :param seed: prime used as p for the first hash function
+        :param buffer: optional existing buffer (e.g. a memoryview of an mmap) holding the packed bits,
+                       used instead of allocating a new bytearray
+        """
+        assert backend in self.BACKENDS, "backend must be one of " + str(self.BACKENDS)
+        assert hash_scheme in HASH_SCHEMES, "hash_scheme must be one of " + str(HASH_SCHEMES)
+        assert buffer is None or backend == "packed", "an external buffer requires the packed backend"
+
+        if hash_scheme == "blocked":
+            size = -(-size // BLOCK_BITS) * BLOCK_BITS
+
         self.size = size
         self.number_of_hash_functions = number_of_hash_functions
-        self.bit_array = [0] * size  # initialize a bit array of length size and all 0s
+        self.backend = backend
+        self.hash_scheme = hash_scheme
+        self.seed = seed
+        self._mmap = None
+        self._allocate(buffer)
+
+        # the primes used as p are computed once here instead of on every add / lookup
+        self._primes = self._generate_primes()
+
+
+    def _allocate(self, buffer):
+        """
+        Creates the storage of the filter (bit_array), or wraps buffer if one was given.
+        """
+        if buffer is not None:
+            assert len(buffer) == (self.size + 7) // 8, "buffer length does not match the filter size"
+            self.bit_array = buffer
+        elif self.backend == "packed":
+            self.bit_array = bytearray((self.size + 7) // 8)  # bit i lives in byte i // 8, at position i % 8
+        else:
+            self.bit_array = [0] * self.size  # initialize a bit array of length size and all 0s
+
+
+    def _generate_primes(self):
+        """
+        Returns the primes used as p: k of them for the "prime" scheme, 2 for the other schemes.
+        """
+        number_of_primes = self.number_of_hash_functions if self.hash_scheme == "prime" else 2
+        return [self.seed] + primes_from(self.seed + 1, number_of_primes - 1)
+
+
+    def _set_bit(self, index):
+        if self.backend == "packed":
+            self.bit_array[index >> 3] |= 1 << (index & 7)
+        else:
+            self.bit_array[index] = 1
+
+
+    def _get_bit(self, index):
+        if self.backend == "packed":
+            return (self.bit_array[index >> 3] >> (index & 7)) & 1
+        return self.bit_array[index]
+
+
+    def _check_writable(self):
+        """
+        numpy writes straight into the buffer (np.bitwise_or.at ignores the read-only flag), so a filter
+        opened with mode "r" is rejected up front, like item assignment on its memoryview would be.
+        """
+        if self.backend == "packed" and memoryview(self.bit_array).readonly:
+            raise TypeError("the filter is read-only, open it with mode 'r+' to add strings")
+
+
+    def _mixed_hash(self, s):
+        """
+        Returns the 64-bit base hash of the "double" and "blocked" schemes.
+        Two 31-bit polynomial hashes are joined and mixed so filters larger than 2**31 bits are covered
+        and the values derived from it do not inherit the correlation between polynomial hashes of the
+        same string.
+        """
+        x = compute_string_hash(s=s, p=self._primes[0], m=DOUBLE_HASH_MODULUS)
+        y = compute_string_hash(s=s, p=self._primes[1], m=DOUBLE_HASH_MODULUS)
+        return mix64((x << 31) | y)
+
+
+    def _iter_indices(self, s):
+        """
+        Yields the k bit indices of string s. This is a generator so lookups can stop at the first 0 bit.
+        """
+        if self.hash_scheme == "prime":
+            for p in self._primes:
+                yield compute_string_hash(s=s, p=p, m=self.size)
+        elif self.hash_scheme == "double":
+            z = self._mixed_hash(s)
+            h1 = z % self.size
+            # a step of 0 would map every hash function onto the same bit
+            h2 = mix64(z) % self.size or 1
+            for i in range(self.number_of_hash_functions):
+                yield (h1 + i * h2) % self.size
+        else:
+            z = self._mixed_hash(s)
+            block_start = (z % (self.size // BLOCK_BITS)) * BLOCK_BITS
+            # double hashing inside the block, an odd step visits 512 distinct offsets before repeating
+            h = mix64(z)
+            offset = h % BLOCK_BITS
+            step = ((h >> 9) % BLOCK_BITS) | 1
+            for i in range(self.number_of_hash_functions):
+                yield block_start + (offset + i * step) % BLOCK_BITS
 
 
     def add_string(self, s):
-        p = 53
-        for i in range(self.number_of_hash_functions):
-            index = compute_string_hash(s=s, p=p, m=self.size) 
+        for index in self._iter_indices(s):
             # set the bit at the obtained index to 1 to mark membership
-            self.bit_array[index] = 1
-            # no need to compute the next line if num of hash is 1
-            if self.number_of_hash_functions > 1:
-                # change p to be the next prime number so the hash value changes
-                p = _gen_next_prime(p)
-            
+            self._set_bit(index)
+
 
     def check_membership(self, s):
-        p = 53
-        for i in range(self.number_of_hash_functions):
-            # check if hashed index is set to 1
-            index = compute_string_hash(s=s, p=p, m=self.size)
+        for index in self._iter_indices(s):
             # now check if the bit was set to 1 at the index
-            if self.bit_array[index] == 0:
+            if self._get_bit(index) == 0:
                 return False
-            # change p to be the next prime number so the hash value changes
-            p = _gen_next_prime(p)
         return True
 
 
+    def _batch_indices(self, strings):
+        """
+        Vectorized _iter_indices: returns an (n x k) numpy array with the bit indices of every string.
+        """
+        # the strings are encoded once and hashed with every prime
+        encoded = encode_strings(strings)
+        if self.hash_scheme == "prime":
+            return np.stack([compute_encoded_hashes(encoded, p=p, m=self.size) for p in self._primes], axis=1)
+
+        x = compute_encoded_hashes(encoded, p=self._primes[0], m=DOUBLE_HASH_MODULUS).astype(np.uint64)
+        y = compute_encoded_hashes(encoded, p=self._primes[1], m=DOUBLE_HASH_MODULUS).astype(np.uint64)
+        z = mix64((x << np.uint64(31)) | y)
+        steps = np.arange(self.number_of_hash_functions, dtype=np.uint64)
+
+        if self.hash_scheme == "double":
+            h1 = z % np.uint64(self.size)
+            h2 = mix64(z) % np.uint64(self.size)
+            h2[h2 == 0] = 1
+            return ((h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.size)).astype(np.int64)
+
+        block_bits = np.uint64(BLOCK_BITS)
+        block_start = (z % np.uint64(self.size // BLOCK_BITS)) * block_bits
+        h = mix64(z)
+        offset = h % block_bits
+        step = ((h >> np.uint64(9)) % block_bits) | np.uint64(1)
+        offsets = (offset[:, None] + steps[None, :] * step[:, None]) % block_bits
+        return (block_start[:, None] + offsets).astype(np.int64)
+
+
+    def add_many(self, strings, batch_size=65536):
+        """
+        Adds every string of an iterable. With numpy and the packed backend the strings are hashed
+        a batch at a time and the bits are set with one fancy-indexing operation per batch.
+        """
+        if np is None or self.backend != "packed":
+            for s in strings:
+                self.add_string(s)
+            return
+
+        self._check_writable()
+        bits = np.frombuffer(self.bit_array, dtype=np.uint8)
+        for batch in _batched(strings, batch_size):
+            indices = self._batch_indices(batch).ravel()
+            # ufunc.at applies the OR once per index, so indices landing in the same byte are all kept
+            np.bitwise_or.at(bits, indices >> 3, np.left_shift(1, indices & 7).astype(np.uint8))
+
+
+    def contains_many(self, strings, batch_size=65536):
+        """
+        Checks the membership of every string of an iterable.
+
+        :return: boolean numpy array (a list of bools without numpy or with the list backend)
+        """
+        if np is None or self.backend != "packed":
+            return [self.check_membership(s) for s in strings]
+
+        bits = np.frombuffer(self.bit_array, dtype=np.uint8)
+        results = []
+        for batch in _batched(strings, batch_size):
+            indices = self._batch_indices(batch)
+            found = (bits[indices >> 3] >> (indices & 7)) & 1
+            results.append(found.all(axis=1))
+
+        return np.concatenate(results) if results else np.zeros(0, dtype=bool)
+
+
+    def save(self, path):
+        """
+        Writes the filter to path in the binary format described by FILE_HEADER, so it can later be
+        memory-mapped with BloomFilter.open.
+        """
+        assert self.backend == "packed", "only the packed backend can be saved"
+
+        header = FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, self.size, self.number_of_hash_functions,
+                                  HASH_SCHEMES.index(self.hash_scheme), self.seed)
+        chunk = 1 << 24
+        view = memoryview(self.bit_array)
+        with open(path, "wb") as f:
+            f.write(header.ljust(FILE_HEADER_SIZE, b"\0"))
+            for i in range(0, len(view), chunk):
+                f.write(view[i:i + chunk])
+
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        """
+        Memory-maps a filter written by save. Nothing is read up front: pages of the bit array are
+        loaded by the OS on first access and shared between every process mapping the same file.
+
+        :param path: file written by BloomFilter.save
+        :param mode: "r" maps the file read-only (add_string then raises TypeError),
+                     "r+" maps it writable and new bits are written through to the file
+        :return: BloomFilter whose bit_array is a memoryview into the mapping; call close() when done
+        """
+        assert mode in ("r", "r+"), "mode must be 'r' or 'r+'"
+
+        with open(path, "rb" if mode == "r" else "r+b") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ if mode == "r" else mmap.ACCESS_WRITE)
+
+        magic, version, size, number_of_hash_functions, scheme_id, seed = FILE_HEADER.unpack_from(mapping)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            mapping.close()
+            raise ValueError(str(path) + " is not a Bloom Filter file (or has an unsupported version)")
+
+        number_of_bytes = (size + 7) // 8
+        if len(mapping) < FILE_HEADER_SIZE + number_of_bytes:
+            mapping.close()
+            raise ValueError(str(path) + " is truncated")
+
+        buffer = memoryview(mapping)[FILE_HEADER_SIZE:FILE_HEADER_SIZE + number_of_bytes]
+        bloom_filter = cls(size, number_of_hash_functions, hash_scheme=HASH_SCHEMES[scheme_id], seed=seed,
+                           buffer=buffer)
+        bloom_filter._mmap = mapping
+        return bloom_filter
+
+
+    def close(self):
+        """
+        Releases the memory mapping of a filter returned by BloomFilter.open (no-op otherwise).
+        """
+        if self._mmap is not None:
+            self.bit_array.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def popcount(self):
+        """
+        Returns the number of bits set to 1 in the filter.
+        The packed backend counts a chunk of bytes at a time so very large filters are never
+        turned into one giant integer.
+        """
+        if self.backend == "list":
+            return sum(self.bit_array)
+
+        chunk = 1 << 20
+        view = memoryview(self.bit_array)
+        return sum(int.from_bytes(view[i:i + chunk], "little").bit_count() for i in range(0, len(view), chunk))
+
+
+    def fill_ratio(self):
+        """
+        Fraction of bits set to 1. The false positive rate is roughly fill_ratio ** k.
+        """
+        return self.popcount() / self.size
+
+
+    def memory_usage(self):
+        """
+        Number of bytes used to hold the bit array. For the list backend every slot is an
+        8-byte pointer to a (shared) small int object, for the packed backend a slot is 1 bit.
+        For a filter on an external buffer (e.g. from BloomFilter.open) this is the size of the buffer,
+        sys.getsizeof would only count the memoryview object.
+        """
+        if isinstance(self.bit_array, memoryview):
+            return self.bit_array.nbytes
+        return sys.getsizeof(self.bit_array)
+
+
+    def _check_compatible(self, other):
+        """
+        Two filters can only be combined if the same string sets the same bits in both.
+        """
+        if (self.size, self.number_of_hash_functions, self.backend, self.hash_scheme, self.seed) != \
+                (other.size, other.number_of_hash_functions, other.backend, other.hash_scheme, other.seed):
+            raise ValueError("filters must have the same size, number of hash functions, backend, hash scheme and seed")
+
+
+    def _combine_in_place(self, other, operation):
+        """
+        Applies operation ("or" / "and") bit-wise between self and other, storing the result in self.
+        """
+        self._check_compatible(other)
+        self._check_writable()
+
+        if self.backend == "list":
+            if operation == "or":
+                self.bit_array[:] = [a | b for a, b in zip(self.bit_array, other.bit_array)]
+            else:
+                self.bit_array[:] = [a & b for a, b in zip(self.bit_array, other.bit_array)]
+            return self
+
+        if np is not None:
+            bits = np.frombuffer(self.bit_array, dtype=np.uint8)
+            other_bits = np.frombuffer(other.bit_array, dtype=np.uint8)
+            (np.bitwise_or if operation == "or" else np.bitwise_and)(bits, other_bits, out=bits)
+            return self
+
+        chunk = 1 << 20
+        view, other_view = memoryview(self.bit_array), memoryview(other.bit_array)
+        for i in range(0, len(view), chunk):
+            a = int.from_bytes(view[i:i + chunk], "little")
+            b = int.from_bytes(other_view[i:i + chunk], "little")
+            combined = a | b if operation == "or" else a & b
+            view[i:i + chunk] = combined.to_bytes(min(chunk, len(view) - i), "little")
+        return self
+
+
+    def copy(self):
+        """
+        Returns an in-memory copy of the filter (also of a memory-mapped one).
+        """
+        if self.backend not in ("packed", "list"):
+            raise ValueError("only bit filters (packed or list backend) can be copied")
+
+        result = BloomFilter(self.size, self.number_of_hash_functions, backend=self.backend,
+                             hash_scheme=self.hash_scheme, seed=self.seed)
+        result.bit_array[:] = self.bit_array
+        return result
+
+
+    def union(self, other):
+        """
+        Filter containing the strings of both filters. It is exactly the filter that would have been
+        built by adding all strings of both, so partial filters built in parallel can be merged.
+        """
+        self._check_compatible(other)
+        return self.copy()._combine_in_place(other, "or")
+
+
+    def intersection(self, other):
+        """
+        Filter that reports strings added to both filters (it can have a higher false positive rate
+        than a filter built from the actual intersection, never false negatives).
+        """
+        self._check_compatible(other)
+        return self.copy()._combine_in_place(other, "and")
+
+
+    def __or__(self, other):
+        return self.union(other)
+
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+
+    def __ior__(self, other):
+        return self._combine_in_place(other, "or")
+
+
+    def __iand__(self, other):
+        return self._combine_in_place(other, "and")
+
+
     def __str__(self):
         result = "Bloom Filter Size: " + str(self.size) + "\nNumber of Hash Functions: " + str(self.number_of_hash_functions)
 
-        result += "\nBit Array:\n" + str(self.bit_array)
+        result += "\nBit Array:\n" + str([self._get_bit(i) for i in range(self.size)])
 
         return result
 
@@ -75,26 +464,26 @@ def get_optim_num_of_hash_functs(filter_size, number_of_anticipated_elements):
     return round(math.log(2) * m / n)
 
 
-input_strings = ["nee", "vee", "wowzers", "gilu", "nisu", "visu", "kalu"]
-
-bloom_filter1 = BloomFilter(size=10, number_of_hash_functions=1)
-for s in input_strings:
-    bloom_filter1.add_string(s=s)
+if __name__ == "__main__":
+    input_strings = ["nee", "vee", "wowzers", "gilu", "nisu", "visu", "kalu"]
 
-print(bloom_filter1)
-print(bloom_filter1.check_membership("gila"))  # this produces a false positive
+    bloom_filter1 = BloomFilter(size=10, number_of_hash_functions=1)
+    for s in input_strings:
+        bloom_filter1.add_string(s=s)
 
-optimal_filter_size = get_optim_bloom_filter_size(len(input_strings), desired_false_positive_rate=0.001)
+    print(bloom_filter1)
+    print(bloom_filter1.check_membership("gila"))  # this produces a false positive
 
-optimal_num_of_hash_functions = get_optim_num_of_hash_functs(optimal_filter_size, len(input_strings))
+    optimal_filter_size = get_optim_bloom_filter_size(len(input_strings), desired_false_positive_rate=0.001)
 
-print("optimal filter size would be:", optimal_filter_size)
-print("optimal number of hash functions:", optimal_num_of_hash_functions)
+    optimal_num_of_hash_functions = get_optim_num_of_hash_functs(optimal_filter_size, len(input_strings))
 
-bloom_filter2 = BloomFilter(size=optimal_filter_size, number_of_hash_functions=optimal_num_of_hash_functions)
-for s in input_strings:
-    bloom_filter2.add_string(s=s)
+    print("optimal filter size would be:", optimal_filter_size)
+    print("optimal number of hash functions:", optimal_num_of_hash_functions)
 
-print(bloom_filter2)
-print(bloom_filter2.check_membership("gila"))  # this correctly produces a False
+    bloom_filter2 = BloomFilter(size=optimal_filter_size, number_of_hash_functions=optimal_num_of_hash_functions)
+    for s in input_strings:
+        bloom_filter2.add_string(s=s)
 
+    print(bloom_filter2)
+    print(bloom_filter2.check_membership("gila"))  # this correctly produces a False
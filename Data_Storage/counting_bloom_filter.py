@@ -0,0 +1,141 @@
+from bloom_filter import BloomFilter
+import sys
+
+"""
+This file contains implementation of a counting Bloom Filter, which supports removing strings.
+Instead of a single bit, every slot holds a 4-bit counter (two counters packed per byte) that is
+incremented when a string hashes to it and decremented when the string is removed.
+A slot is "set" while its counter is above 0.
+
+4 bits are enough in practice: with an optimally sized filter the chance of any counter reaching 16
+is negligible. Should it happen anyway, the overflow policy decides what to do:
+    "saturate": the counter sticks at 15 and is never decremented again (can only cause false positives)
+    "raise": the add is rejected with an OverflowError before any counter is changed
+"""
+
+COUNTER_MAX = 15
+
+# number of non-zero counters stored in each possible byte value
+_NON_ZERO_NIBBLES = bytes(((b & 15) > 0) + ((b >> 4) > 0) for b in range(256))
+
+
+class CountingBloomFilter(BloomFilter):
+    BACKENDS = ("counting",)
+
+    def __init__(self, size=1000, number_of_hash_functions=1, hash_scheme="prime", seed=53, overflow="saturate"):
+        """
+        :param size: number of counters in the filter
+        :param number_of_hash_functions: number of counters incremented per inserted string
+        :param hash_scheme: see BloomFilter
+        :param seed: see BloomFilter
+        :param overflow: "saturate" or "raise", see the module docstring
+        """
+        assert overflow in ("saturate", "raise"), "overflow must be 'saturate' or 'raise'"
+
+        self.overflow = overflow
+        super().__init__(size, number_of_hash_functions, backend="counting", hash_scheme=hash_scheme, seed=seed)
+
+
+    def _allocate(self, buffer):
+        self.counters = bytearray((self.size + 1) // 2)  # counter i lives in byte i // 2, low nibble if i is even
+
+
+    def _get_counter(self, index):
+        return (self.counters[index >> 1] >> ((index & 1) << 2)) & COUNTER_MAX
+
+
+    def _get_bit(self, index):
+        return 1 if self._get_counter(index) else 0
+
+
+    def _set_bit(self, index):
+        # increments the counter, saturated counters stay at COUNTER_MAX
+        if self._get_counter(index) < COUNTER_MAX:
+            self.counters[index >> 1] += 1 << ((index & 1) << 2)
+
+
+    def add_string(self, s):
+        indices = list(self._iter_indices(s))
+        if self.overflow == "raise":
+            # a string can hash several times to the same counter, so count the increments per counter
+            increments = {}
+            for index in indices:
+                increments[index] = increments.get(index, 0) + 1
+            for index, increment in increments.items():
+                if self._get_counter(index) + increment > COUNTER_MAX:
+                    raise OverflowError("counter " + str(index) + " would exceed " + str(COUNTER_MAX))
+
+        for index in indices:
+            self._set_bit(index)
+
+
+    def remove_string(self, s):
+        """
+        Removes a previously added string. Removing a string that was never added can remove other
+        strings as well, so strings that are definitely not members are rejected.
+
+        :return: True if the counters were decremented, False if s is not a member
+        """
+        if not self.check_membership(s):
+            return False
+
+        for index in self._iter_indices(s):
+            counter = self._get_counter(index)
+            # a saturated counter lost track of its real count, so it is never decremented
+            if counter < COUNTER_MAX:
+                self.counters[index >> 1] -= 1 << ((index & 1) << 2)
+
+        return True
+
+
+    def count_estimate(self, s):
+        """
+        Upper bound of how many times s was added (the smallest of its counters).
+        """
+        return min(self._get_counter(index) for index in self._iter_indices(s))
+
+
+    def popcount(self):
+        """
+        Returns the number of non-zero counters.
+        """
+        return sum(self.counters.translate(_NON_ZERO_NIBBLES))
+
+
+    def memory_usage(self):
+        return sys.getsizeof(self.counters)
+
+
+    def copy(self):
+        result = CountingBloomFilter(self.size, self.number_of_hash_functions, hash_scheme=self.hash_scheme,
+                                     seed=self.seed, overflow=self.overflow)
+        result.counters[:] = self.counters
+        return result
+
+
+    # the file format and the bit-wise union / intersection only exist for bit filters
+
+    def save(self, path):
+        raise TypeError("a CountingBloomFilter cannot be saved, only bit filters can")
+
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        raise TypeError("a CountingBloomFilter cannot be opened, use BloomFilter.open")
+
+
+    def _combine_in_place(self, other, operation):
+        raise TypeError("CountingBloomFilters cannot be combined with | or &, only bit filters can")
+
+
+if __name__ == "__main__":
+    input_strings = ["nee", "vee", "wowzers", "gilu", "nisu", "visu", "kalu"]
+
+    counting_filter = CountingBloomFilter(size=100, number_of_hash_functions=3)
+    for s in input_strings:
+        counting_filter.add_string(s)
+
+    print(counting_filter.check_membership("gilu"))  # True
+    counting_filter.remove_string("gilu")
+    print(counting_filter.check_membership("gilu"))  # False, the string was removed
+    print(counting_filter.check_membership("nisu"))  # True, other strings are unaffected
@@ -5,15 +5,24 @@ Primary sources of knowledge include:
     2) https://www.youtube.com/watch?v=eeiSPXCzUiE
 """
 
-def compute_string_hash(s, p=53, m=1e9+9):
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the batch (vectorized) hash
+    np = None
+
+def compute_string_hash(s, p=53, m=10**9+9):
     """
     Polynomial rolling hash function will be used.
     Formula: SUM(s[i] * p**i) mod m
     p = some prime number, usually 31 for lowercase inputs, 53 for both case inputs
     m = some large prime number that will approximate the collision probability (1/m)
         since it will be the array length (or h_table size) in some sense
+    s can also be bytes, bytearray or memoryview, then s[i] is the value of the i-th byte
     """
-    
+
+    if not isinstance(s, str):
+        return PolynomialHasher(p, m).update(s).digest()
+
     hash_result = 0  # initialize the return value
     p_to_i = 1  # initialize p**i because integer overflow is possible inside loop
     for i, c in enumerate(s):
@@ -23,3 +32,338 @@ def compute_string_hash(s, p=53, m=1e9+9):
 
     return hash_result
 
+
+# number of bytes PolynomialHasher hashes with one numpy dot product
+HASH_CHUNK_SIZE = 1 << 16
+# pieces shorter than this are hashed with Horner's rule
+MIN_DOT_PRODUCT_LENGTH = 256
+
+_power_tables = {}  # (p, m) -> numpy table of p**j mod m for j < HASH_CHUNK_SIZE
+
+
+def _power_table(p, m):
+    """
+    Returns the table of p**j mod m for j < HASH_CHUNK_SIZE, built once per (p, m).
+    """
+    if (p, m) not in _power_tables:
+        powers = np.empty(HASH_CHUNK_SIZE, dtype=np.int64)
+        p_to_i = 1
+        for i in range(HASH_CHUNK_SIZE):
+            powers[i] = p_to_i
+            p_to_i = (p_to_i * p) % m
+        _power_tables[(p, m)] = powers
+    return _power_tables[(p, m)]
+
+
+class PolynomialHasher:
+    """
+    Incremental version of compute_string_hash with exact integer arithmetic.
+    Data can be fed in pieces with update(); the digest equals compute_string_hash of all pieces
+    concatenated. Bytes-like input (bytes, bytearray, memoryview) is read through a memoryview, so it is
+    never copied or decoded.
+
+    Every piece is hashed on its own as SUM(data[j] * p**j) and shifted into place by multiplying with
+    p**(length hashed so far). With numpy, a piece of bytes is hashed a chunk at a time as a dot product
+    with a precomputed table of powers, otherwise with Horner's rule.
+    """
+
+    def __init__(self, p=53, m=10**9+9):
+        assert isinstance(m, int), "m must be an integer for exact modular arithmetic"
+
+        self.p = p
+        self.m = m
+        self.length = 0  # number of characters / bytes hashed so far
+        self._hash_result = 0
+        self._p_to_length = 1  # p**length mod m
+        self._powers = None  # numpy table of p**j mod m for j < HASH_CHUNK_SIZE, looked up on first use
+
+
+    def _horner(self, values):
+        """
+        Returns SUM(values[j] * p**j) mod m, evaluated from the last value to the first.
+        """
+        hash_result = 0
+        for value in reversed(values):
+            hash_result = (hash_result * self.p + value) % self.m
+        return hash_result
+
+
+    def _chunk_hash(self, chunk):
+        """
+        Returns SUM(chunk[j] * p**j) mod m for a 1-D memoryview of at most HASH_CHUNK_SIZE bytes.
+        """
+        # every product is below 256 * m, so the dot product of a whole chunk fits in an int64;
+        # short pieces are cheaper with Horner's rule than with numpy
+        if np is None or len(chunk) < MIN_DOT_PRODUCT_LENGTH or 256 * self.m * len(chunk) >= 2**63:
+            return self._horner(chunk)
+
+        if self._powers is None:
+            self._powers = _power_table(self.p, self.m)
+        values = np.frombuffer(chunk, dtype=np.uint8)
+        return int(np.dot(values, self._powers[:len(values)])) % self.m
+
+
+    def _append(self, piece_hash, piece_length):
+        # the piece starts at position self.length, so its hash is shifted by p**length
+        self._hash_result = (self._hash_result + piece_hash * self._p_to_length) % self.m
+        self._p_to_length = (self._p_to_length * pow(self.p, piece_length, self.m)) % self.m
+        self.length += piece_length
+
+
+    def update(self, data):
+        """
+        Hashes the next piece of data (str or bytes-like).
+
+        :return: self, so calls can be chained
+        """
+        if isinstance(data, str):
+            self._append(self._horner([ord(c) for c in data]), len(data))
+            return self
+
+        view = memoryview(data).cast("B")
+        for i in range(0, len(view), HASH_CHUNK_SIZE):
+            chunk = view[i:i + HASH_CHUNK_SIZE]
+            self._append(self._chunk_hash(chunk), len(chunk))
+
+        return self
+
+
+    def digest(self):
+        """
+        Hash of everything passed to update so far.
+        """
+        return self._hash_result
+
+
+def compute_file_hash(file_object, p=53, m=10**9+9, chunk_size=1 << 20):
+    """
+    Hashes a binary file object incrementally, reading chunk_size bytes at a time into one reused buffer.
+    The result equals compute_string_hash of the whole content.
+    """
+    hasher = PolynomialHasher(p, m)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        read = file_object.readinto(buffer)
+        if not read:
+            return hasher.digest()
+        hasher.update(view[:read])
+
+
+def _code_matrix(strings):
+    """
+    (n x longest length) uint32 matrix of the code points (or byte values) of strings, padded with 0.
+    """
+    if all(isinstance(s, str) for s in strings):
+        return np.array(strings, dtype=str).view(np.uint32).reshape(len(strings), -1)
+
+    # numpy would decode bytes as ASCII, so a mixed batch is copied into the matrix row by row
+    rows = [np.frombuffer(s.encode("utf-32-le", "surrogatepass"), dtype=np.uint32) if isinstance(s, str)
+            else np.frombuffer(memoryview(s).cast("B"), dtype=np.uint8) for s in strings]
+    codes = np.zeros((len(rows), max(len(row) for row in rows)), dtype=np.uint32)
+    for i, row in enumerate(rows):
+        codes[i, :len(row)] = row
+    return codes
+
+
+def encode_strings(strings):
+    """
+    Encodes a batch of strings (or bytes-like objects) for compute_encoded_hashes (requires numpy).
+    The strings are grouped by the bit length of their length and every group gets its own code point matrix,
+    so a row is padded to at most twice its length and one long string never sizes the whole batch.
+    The result can be hashed with any number of (p, m) pairs without encoding the strings again.
+
+    :return: (strings, [(indices, codes) per group]) where codes holds the strings at indices
+    """
+
+    assert np is not None, "encode_strings requires numpy"
+
+    length_classes = np.fromiter((len(s).bit_length() for s in strings), dtype=np.int64, count=len(strings))
+    groups = []
+    for length_class in np.unique(length_classes):
+        indices = np.flatnonzero(length_classes == length_class)
+        groups.append((indices, _code_matrix([strings[i] for i in indices])))
+
+    return strings, groups
+
+
+def compute_encoded_hashes(encoded, p=53, m=10**9+9):
+    """
+    compute_string_hash of every string of a batch encoded by encode_strings.
+    Shorter strings of a group are padded with 0 which adds nothing to the sum, and the polynomial is
+    evaluated one column at a time.
+    Returns an int64 array whose i-th entry equals compute_string_hash(strings[i], p, m) for integer m.
+    """
+
+    strings, groups = encoded
+    hash_result = np.zeros(len(strings), dtype=np.int64)
+    for indices, codes in groups:
+        # every intermediate value is below m + max_code * m and has to fit in an int64
+        max_code = int(codes.max()) if codes.size else 0
+        if m * (max_code + 1) >= 2**63:
+            hash_result[indices] = [compute_string_hash(strings[i], p, m) for i in indices]
+            continue
+
+        group_hash = np.zeros(len(indices), dtype=np.int64)
+        p_to_i = 1
+        for column in codes.T:
+            group_hash = (group_hash + column.astype(np.int64) * p_to_i) % m
+            p_to_i = (p_to_i * p) % m
+        hash_result[indices] = group_hash
+
+    return hash_result
+
+
+def compute_string_hashes(strings, p=53, m=10**9+9):
+    """
+    Vectorized version of compute_string_hash for a batch of strings (requires numpy), see encode_strings.
+    Bytes-like items are hashed by their byte values, like compute_string_hash does.
+    Returns an int64 array whose i-th entry equals compute_string_hash(strings[i], p, m) for integer m.
+    """
+
+    assert np is not None, "compute_string_hashes requires numpy"
+
+    return compute_encoded_hashes(encode_strings(strings), p, m)
+
+
+def mix64(z):
+    """
+    SplitMix64 finalizer: scrambles the bits of a 64-bit integer so that inputs which differ
+    in a few bits produce unrelated outputs. Used to turn correlated polynomial hashes into
+    independent looking ones.
+    """
+
+    mask = (1 << 64) - 1
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask
+    return z ^ (z >> 31)
+
+
+class RollingHashIndex:
+    """
+    Prefix hashes of a text, so that the polynomial hash of any substring is available in O(1).
+
+    prefix[j] holds the hash of text[:j]. With the formula of compute_string_hash,
+        hash(text[i:j]) = (prefix[j] - prefix[i]) * p**(-i)  mod m
+    which is why the modular inverses of the powers of p are precomputed as well.
+    Every hash is computed for two moduli at once (double hashing): two substrings only collide
+    if they collide for both, which happens with probability about 1 / (m1 * m2).
+    """
+
+    def __init__(self, text, p=53, moduli=(10**9 + 7, 10**9 + 9)):
+        """
+        :param text: string (or bytes) to index
+        :param p: base of the polynomial hash
+        :param moduli: the prime moduli (each hash is a tuple with one value per modulus)
+        """
+        self.text = text
+        self.p = p
+        self.moduli = moduli
+        self.prefixes = []  # one prefix hash list per modulus
+        self.inverse_powers = []  # p**(-i) mod m for every i, one list per modulus
+
+        codes = [ord(c) for c in text] if isinstance(text, str) else memoryview(text).cast("B")
+        for m in moduli:
+            prefix = [0] * (len(text) + 1)
+            inverse_power = [1] * (len(text) + 1)
+            inverse_p = pow(p, -1, m)
+            hash_result = 0
+            p_to_i = 1
+            for i, code in enumerate(codes):
+                hash_result = (hash_result + code * p_to_i) % m
+                p_to_i = (p_to_i * p) % m
+                prefix[i + 1] = hash_result
+                inverse_power[i + 1] = (inverse_power[i] * inverse_p) % m
+            self.prefixes.append(prefix)
+            self.inverse_powers.append(inverse_power)
+
+
+    def substring_hash(self, start, end):
+        """
+        Hash of text[start:end] in O(1); element i equals compute_string_hash(text[start:end], p, moduli[i]).
+        """
+        return tuple((prefix[end] - prefix[start]) * inverse_power[start] % m
+                     for prefix, inverse_power, m in zip(self.prefixes, self.inverse_powers, self.moduli))
+
+
+    def hash_of(self, pattern):
+        """
+        Hash of an arbitrary string, comparable with substring_hash.
+        """
+        return tuple(compute_string_hash(pattern, self.p, m) for m in self.moduli)
+
+
+    def _window_hashes(self, length):
+        """
+        Yields (start, hash) for every substring of the given length, from left to right.
+        """
+        for start in range(len(self.text) - length + 1):
+            yield start, self.substring_hash(start, start + length)
+
+
+    def find(self, pattern):
+        """
+        Returns the start positions of every occurrence of pattern (Rabin-Karp).
+        """
+        return self.find_all([pattern])[pattern]
+
+
+    def find_all(self, patterns):
+        """
+        Multi-pattern Rabin-Karp search: the patterns are grouped by length and the text is scanned
+        once per distinct length, looking up every window hash in a dictionary of pattern hashes.
+        Candidate matches are compared against the text, so hash collisions never produce wrong results.
+
+        :return: dict mapping every pattern to the list of its start positions
+        """
+        occurrences = {pattern: [] for pattern in patterns}
+        by_length = {}
+        for pattern in occurrences:
+            if 0 < len(pattern) <= len(self.text):
+                by_length.setdefault(len(pattern), {}).setdefault(self.hash_of(pattern), []).append(pattern)
+
+        for length, hashes in by_length.items():
+            for start, window_hash in self._window_hashes(length):
+                for pattern in hashes.get(window_hash, ()):
+                    if self.text.startswith(pattern, start):
+                        occurrences[pattern].append(start)
+
+        return occurrences
+
+
+    def duplicate_substrings(self, length):
+        """
+        Finds every substring of the given length that occurs more than once.
+
+        :return: dict mapping each repeated substring to the list of its start positions
+        """
+        positions = {}
+        for start, window_hash in self._window_hashes(length):
+            positions.setdefault(window_hash, []).append(start)
+
+        duplicates = {}
+        for starts in positions.values():
+            if len(starts) > 1:
+                for start in starts:
+                    duplicates.setdefault(self.text[start:start + length], []).append(start)
+
+        return {substring: starts for substring, starts in duplicates.items() if len(starts) > 1}
+
+
+    def longest_repeated_substring(self):
+        """
+        Returns the longest substring occurring at least twice (possibly overlapping), found by binary
+        search on the length since a repeat of length L implies a repeat of every shorter length.
+        """
+        low, high = 0, len(self.text) - 1
+        best = self.text[:0]
+        while low < high:
+            length = (low + high + 1) // 2
+            duplicates = self.duplicate_substrings(length)
+            if duplicates:
+                best = min(duplicates, key=lambda substring: duplicates[substring][0])
+                low = length
+            else:
+                high = length - 1
+
+        return best
@@ -0,0 +1,80 @@
+from bloom_filter import BloomFilter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+"""
+This file contains a builder that fills one Bloom Filter using several processes.
+
+The strings are split into one slice per worker. Every worker fills its own partial filter directly
+inside a shared memory block (so the bits never travel through a pipe), and the parent merges the
+partial filters with a bit-wise OR. Since a Bloom Filter of a set is the OR of the filters of any
+split of that set, the result is identical to adding every string to a single filter.
+"""
+
+def _fill_partial_filter(shared_memory_name, size, number_of_hash_functions, hash_scheme, seed, strings):
+    """
+    Worker: adds strings to a filter whose bit array is the shared memory block with the given name.
+    """
+    block = shared_memory.SharedMemory(name=shared_memory_name)
+    buffer = block.buf[:(size + 7) // 8]
+    try:
+        partial_filter = BloomFilter(size, number_of_hash_functions, hash_scheme=hash_scheme, seed=seed,
+                                     buffer=buffer)
+        partial_filter.add_many(strings)
+        del partial_filter
+    finally:
+        buffer.release()
+        block.close()
+
+    return len(strings)
+
+
+def build_bloom_filter_parallel(strings, size, number_of_hash_functions, hash_scheme="double", seed=53,
+                                workers=None):
+    """
+    Builds a BloomFilter containing strings using a pool of worker processes.
+
+    :param strings: sequence of strings to add
+    :param size: see BloomFilter
+    :param number_of_hash_functions: see BloomFilter
+    :param hash_scheme: see BloomFilter
+    :param seed: see BloomFilter
+    :param workers: number of worker processes (defaults to the number of CPUs)
+    :return: packed BloomFilter equal to the one built by adding every string in a single process
+    """
+    workers = workers or os.cpu_count() or 1
+    result = BloomFilter(size, number_of_hash_functions, hash_scheme=hash_scheme, seed=seed)
+    size = result.size  # the "blocked" scheme rounds the size up to whole blocks
+    number_of_bytes = len(result.bit_array)
+
+    # every worker gets an interleaved slice, so all slices have about the same length
+    slices = [strings[i::workers] for i in range(workers)]
+    blocks = [shared_memory.SharedMemory(create=True, size=number_of_bytes) for _ in slices]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_fill_partial_filter, block.name, size, number_of_hash_functions,
+                                       hash_scheme, seed, part) for block, part in zip(blocks, slices)]
+            for future in futures:
+                future.result()
+
+        for block in blocks:
+            buffer = block.buf[:number_of_bytes]
+            result |= BloomFilter(size, number_of_hash_functions, hash_scheme=hash_scheme, seed=seed, buffer=buffer)
+            buffer.release()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return result
+
+
+if __name__ == "__main__":
+    input_strings = ["string" + str(i) for i in range(100000)]
+
+    parallel_filter = build_bloom_filter_parallel(input_strings, size=1000000, number_of_hash_functions=7)
+    single_filter = BloomFilter(size=1000000, number_of_hash_functions=7, hash_scheme="double")
+    single_filter.add_many(input_strings)
+
+    print("same bits as a single process build:", parallel_filter.bit_array == single_filter.bit_array)
@@ -0,0 +1,151 @@
+from bisect import bisect_left, bisect_right
+
+"""
+This file contains the prime number utilities used by the hashing code.
+
+Small primes come from a sieve of Eratosthenes that is cached and grown (doubled) on demand, so after
+warm-up next_prime and nth_prime are table lookups. Numbers beyond the sieve are tested with the
+Miller-Rabin test using the first 12 primes as bases, which is deterministic for every n < 3.3 * 10**24
+(so in particular for all 64-bit integers).
+"""
+
+# the sieve never grows past this bound, larger numbers use Miller-Rabin
+MAX_SIEVE_LIMIT = 1 << 24
+
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+_sieve_limit = 0  # the sieve covers the numbers 0 .. _sieve_limit - 1
+_is_prime_flags = bytearray()
+_prime_table = []
+
+
+def _extend_sieve(limit):
+    """
+    Makes sure the cached sieve covers every number below limit (capped at MAX_SIEVE_LIMIT).
+    """
+    global _sieve_limit, _is_prime_flags, _prime_table
+
+    if limit <= _sieve_limit:
+        return
+
+    # grow at least geometrically so repeated small extensions stay cheap
+    limit = min(max(limit, 2 * _sieve_limit, 1024), MAX_SIEVE_LIMIT)
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\0\0"
+    for i in range(2, int(limit**0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+
+    _is_prime_flags = flags
+    _prime_table = [i for i in range(limit) if flags[i]]
+    _sieve_limit = limit
+
+
+def _miller_rabin(n):
+    d = n - 1
+    r = 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+
+    for a in _MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def is_prime(n):
+    """
+    Returns True if n is prime: a table lookup inside the sieve, Miller-Rabin beyond it.
+    """
+    if n < _sieve_limit:
+        return bool(_is_prime_flags[n]) if n >= 0 else False
+    if n < 2:
+        return False
+    for p in _MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+
+    return _miller_rabin(n)
+
+
+def next_prime(n):
+    """
+    Returns the smallest prime greater than n.
+    """
+    if n + 1 < MAX_SIEVE_LIMIT:
+        # there is always a prime between n and 2n (Bertrand's postulate)
+        _extend_sieve(2 * n + 2)
+        i = bisect_right(_prime_table, n)
+        if i < len(_prime_table):
+            return _prime_table[i]
+
+    candidate = n + 1 if n % 2 == 0 else n + 2
+    while not is_prime(candidate):
+        candidate += 2
+
+    return candidate
+
+
+def prime_range(start, stop):
+    """
+    Returns the list of primes p with start <= p < stop.
+    """
+    if stop <= MAX_SIEVE_LIMIT:
+        _extend_sieve(stop)
+        return _prime_table[bisect_left(_prime_table, start):bisect_left(_prime_table, stop)]
+
+    primes = prime_range(start, MAX_SIEVE_LIMIT) if start < MAX_SIEVE_LIMIT else []
+    candidate = max(start, MAX_SIEVE_LIMIT) | 1
+    while candidate < stop:
+        if is_prime(candidate):
+            primes.append(candidate)
+        candidate += 2
+
+    return primes
+
+
+def nth_prime(n):
+    """
+    Returns the n-th prime (nth_prime(0) == 2). O(1) once the table covers it.
+    """
+    while n >= len(_prime_table):
+        if _sieve_limit >= MAX_SIEVE_LIMIT:
+            raise ValueError("nth_prime only covers primes below " + str(MAX_SIEVE_LIMIT))
+        _extend_sieve(_sieve_limit + 1)
+
+    return _prime_table[n]
+
+
+def primes_from(start, count):
+    """
+    Returns the first count primes greater than or equal to start.
+    """
+    primes = []
+    if start < MAX_SIEVE_LIMIT:
+        _extend_sieve(start + 1)
+        i = bisect_left(_prime_table, start)
+        while i + count > len(_prime_table) and _sieve_limit < MAX_SIEVE_LIMIT:
+            _extend_sieve(_sieve_limit + 1)
+        primes = _prime_table[i:i + count]
+
+    while len(primes) < count:
+        primes.append(next_prime(primes[-1] if primes else start - 1))
+
+    return primes
+
+
+def prime_table():
+    """
+    Returns the cached table of all primes below the current sieve limit (do not modify it).
+    """
+    _extend_sieve(1)
+    return _prime_table
@@ -0,0 +1,129 @@
+from bloom_filter import BloomFilter, get_optim_bloom_filter_size, get_optim_num_of_hash_functs
+
+"""
+This file contains implementation of a scalable Bloom Filter: a filter that does not need to know
+the number of elements ahead of time.
+Primary source of knowledge:
+    1) Almeida, Baquero, Preguica, Hutchison - "Scalable Bloom Filters" (2007)
+
+It keeps a chain of ordinary Bloom Filters. Once the newest filter holds as many strings as it was
+sized for, a new filter with growth_factor times the capacity is appended. Older filters are never
+rehashed, they only keep answering membership queries.
+Filter i is built for a false positive rate of P0 * r**i (r = tightening_ratio), so the overall rate
+is bounded by the geometric series P0 / (1 - r), and P0 is chosen such that this equals the target.
+"""
+
+class ScalableBloomFilter:
+    def __init__(self, initial_capacity=1000, false_positive_rate=0.01, growth_factor=2, tightening_ratio=0.5,
+                 hash_scheme="double"):
+        """
+        :param initial_capacity: number of strings the first sub-filter is sized for
+        :param false_positive_rate: target false positive rate of the whole chain
+        :param growth_factor: capacity multiplier between consecutive sub-filters
+        :param tightening_ratio: false positive rate multiplier between consecutive sub-filters (0 < r < 1)
+        :param hash_scheme: hash scheme used by every sub-filter, see BloomFilter. The sub-filters are sized
+                            with the classic formula, which the "blocked" scheme does not reach: its measured
+                            false positive rate is well above the target (about 0.017 for 0.01)
+        """
+        assert initial_capacity > 0, "initial capacity must be positive"
+        assert 0 < false_positive_rate < 1, "false positive rate must be between 0 and 1"
+        assert growth_factor >= 1, "growth factor cannot shrink the sub-filters"
+        assert 0 < tightening_ratio < 1, "tightening ratio must be between 0 and 1"
+
+        self.initial_capacity = initial_capacity
+        self.false_positive_rate = false_positive_rate
+        self.growth_factor = growth_factor
+        self.tightening_ratio = tightening_ratio
+        self.hash_scheme = hash_scheme
+
+        self.filters = []  # chain of sub-filters, the last one receives new strings
+        self.capacities = []  # number of strings each sub-filter was sized for
+        self.counts = []  # number of strings added to each sub-filter
+        self._add_filter()
+
+
+    def _add_filter(self):
+        i = len(self.filters)
+        capacity = int(self.initial_capacity * self.growth_factor**i)
+        error_rate = self.false_positive_rate * (1 - self.tightening_ratio) * self.tightening_ratio**i
+
+        size = get_optim_bloom_filter_size(capacity, desired_false_positive_rate=error_rate)
+        number_of_hash_functions = max(1, get_optim_num_of_hash_functs(size, capacity))
+
+        self.filters.append(BloomFilter(size, number_of_hash_functions, hash_scheme=self.hash_scheme))
+        self.capacities.append(capacity)
+        self.counts.append(0)
+
+
+    def add_string(self, s):
+        """
+        Adds s to the newest sub-filter, growing the chain first if that filter is full.
+        Strings that are (probably) already present are skipped so they do not use up capacity.
+
+        :return: True if s was added, False if it was already a member
+        """
+        if self.check_membership(s):
+            return False
+
+        if self.counts[-1] >= self.capacities[-1]:
+            self._add_filter()
+        self.filters[-1].add_string(s)
+        self.counts[-1] += 1
+
+        return True
+
+
+    def add_many(self, strings):
+        for s in strings:
+            self.add_string(s)
+
+
+    def check_membership(self, s):
+        # the newest filter is the largest, so most members are found there first
+        for bloom_filter in reversed(self.filters):
+            if bloom_filter.check_membership(s):
+                return True
+        return False
+
+
+    def expected_false_positive_rate(self):
+        """
+        Upper bound of the false positive rate with the current chain: a lookup is a false positive
+        if any sub-filter reports one.
+        """
+        probability_no_false_positive = 1
+        for bloom_filter in self.filters:
+            probability_no_false_positive *= 1 - bloom_filter.fill_ratio()**bloom_filter.number_of_hash_functions
+
+        return 1 - probability_no_false_positive
+
+
+    def memory_usage(self):
+        return sum(bloom_filter.memory_usage() for bloom_filter in self.filters)
+
+
+    def __len__(self):
+        return sum(self.counts)
+
+
+    def __str__(self):
+        result = "Scalable Bloom Filter with " + str(len(self.filters)) + " sub-filters holding " + str(len(self)) + \
+                 " strings (target false positive rate: " + str(self.false_positive_rate) + ")"
+        for bloom_filter, capacity, count in zip(self.filters, self.capacities, self.counts):
+            result += "\n  size: " + str(bloom_filter.size) + " hash functions: " + \
+                      str(bloom_filter.number_of_hash_functions) + " strings: " + str(count) + "/" + str(capacity)
+
+        return result
+
+
+if __name__ == "__main__":
+    input_strings = ["string" + str(i) for i in range(20000)]
+
+    scalable_filter = ScalableBloomFilter(initial_capacity=100, false_positive_rate=0.01)
+    scalable_filter.add_many(input_strings)
+    print(scalable_filter)
+
+    queries = ["other" + str(i) for i in range(20000)]
+    false_positives = sum(scalable_filter.check_membership(s) for s in queries)
+    print("measured false positive rate:", false_positives / len(queries))
+    print("expected false positive rate:", scalable_filter.expected_false_positive_rate())
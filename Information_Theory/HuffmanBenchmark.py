@@ -0,0 +1,109 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from HuffmanCodec import compress, decompress, CHUNK_SIZE
+
+
+"""
+Huffman Codec Benchmark
+
+Compresses and decompresses sample data with HuffmanCodec (through files, chunk by chunk) and reports the
+compression ratio and the throughput in MB/s of both directions. The round trip is checked byte by byte.
+With --workers, the chunked container of HuffmanParallel is timed as well, for every given number of processes.
+
+Usage:
+    python HuffmanBenchmark.py [--size-mb 8] [--file path] [--chunk-size 1048576] [--workers 1 2 4 8]
+                               [--max-code-length 12]
+"""
+
+def sample_data(size, seed=0):
+    """
+    English-like text: words drawn with Zipf-distributed frequencies
+    """
+    rng = random.Random(seed)
+    words = ["".join(rng.choice("etaoinshrdlcumwfgypbvkjxqz") for _ in range(rng.randint(1, 9))) for _ in range(2000)]
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    text = bytearray()
+    while len(text) < size:
+        text += " ".join(rng.choices(words, weights, k=10000)).encode() + b".\n"
+    return bytes(text[:size])
+
+
+def _check_round_trip(path, restored_path, chunk_size):
+    with open(path, "rb") as original, open(restored_path, "rb") as restored:
+        while True:
+            a, b = original.read(chunk_size), restored.read(chunk_size)
+            assert a == b, "round trip failed!"
+            if not a:
+                break
+
+
+def _report(name, size, compressed_size, compress_seconds, decompress_seconds):
+    ratio = round(compressed_size / size, 4) if size else None
+    print(f"{name:>12} ratio {ratio}  compress {size / compress_seconds / 1e6:8.2f} MB/s  "
+          f"decompress {size / decompress_seconds / 1e6:8.2f} MB/s")
+
+
+def benchmark(path, chunk_size, workers=(), max_code_length=None):
+    size = os.path.getsize(path)
+    print("input:", path, "(" + str(size) + " bytes)")
+    with tempfile.TemporaryDirectory() as directory:
+        compressed_path = os.path.join(directory, "compressed.huf")
+        restored_path = os.path.join(directory, "restored")
+
+        start = time.perf_counter()
+        with open(path, "rb") as source, open(compressed_path, "wb") as destination:
+            compress(source, destination, chunk_size, max_code_length)
+        compress_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(compressed_path, "rb") as source, open(restored_path, "wb") as destination:
+            decompress(source, destination, chunk_size)
+        decompress_seconds = time.perf_counter() - start
+
+        _check_round_trip(path, restored_path, chunk_size)
+        _report("streaming", size, os.path.getsize(compressed_path), compress_seconds, decompress_seconds)
+
+        for number_of_workers in workers:
+            # imported here: the parallel container needs numpy, the streaming codec does not
+            from HuffmanParallel import compress_parallel, decompress_parallel
+
+            start = time.perf_counter()
+            compress_parallel(path, compressed_path, workers=number_of_workers, max_code_length=max_code_length)
+            compress_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            decompress_parallel(compressed_path, restored_path, workers=number_of_workers)
+            decompress_seconds = time.perf_counter() - start
+
+            _check_round_trip(path, restored_path, chunk_size)
+            _report(str(number_of_workers) + " workers", size, os.path.getsize(compressed_path), compress_seconds,
+                    decompress_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the streaming Huffman codec")
+    parser.add_argument("--size-mb", type=float, default=8, help="size of the generated sample text")
+    parser.add_argument("--file", help="compress this file instead of the generated sample text")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, nargs="*", default=[],
+                        help="also time the parallel container with these numbers of worker processes")
+    parser.add_argument("--max-code-length", type=int, help="limit the code lengths (package-merge)")
+    args = parser.parse_args()
+
+    if args.file:
+        benchmark(args.file, args.chunk_size, args.workers, args.max_code_length)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as f:
+        f.write(sample_data(int(args.size_mb * 1e6)))
+    try:
+        benchmark(f.name, args.chunk_size, args.workers, args.max_code_length)
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
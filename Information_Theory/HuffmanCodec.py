@@ -0,0 +1,388 @@
+from HuffmanCoding import huffman_code_lengths, canonical_codes, package_merge_code_lengths
+from array import array
+from collections import Counter
+import io
+import struct
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # without numpy the byte frequencies are counted with collections.Counter
+    np = None
+
+
+"""
+Streaming Huffman compression of bytes
+
+Compressed format:
+    header:     MAGIC, the length of the original data (uint64, little-endian) and 256 code lengths
+                (one byte per byte value, 0 for bytes that do not occur)
+    bitstream:  the canonical Huffman code of every byte, most significant bit first, the last byte padded with 0 bits
+
+Only the code lengths are stored, both sides rebuild the same canonical codes from them (see canonical_codes).
+
+HuffmanEncoder packs the codes into an integer bit accumulator, one lookup per PAIR of input bytes (a table of
+the 65536 concatenated codes of two bytes), and emits whole bytes from the accumulator every FLUSH_BITS bits.
+HuffmanDecoder looks the next PRIMARY_BITS bits up in a table giving ALL the bytes whose codes fit completely
+in them (and the number of bits they use), so short codes are decoded several at a time instead of one tree step
+per bit. Codes longer than PRIMARY_BITS fall back to canonical decoding (comparing the next bits with the first
+code of every longer length). If the longest code is at most MAX_PRIMARY_BITS long, the table covers it, so
+with max_code_length (package-merge, see HuffmanCoding) every lookup goes to one fixed-size table.
+
+Both work on chunks, so compress / decompress handle files of any size in memory bounded by CHUNK_SIZE.
+compress reads its input twice (frequencies, then codes), so the input file has to be seekable.
+"""
+
+MAGIC = b"PAVEHUF1"
+HEADER = struct.Struct("<8sQ256s")
+CHUNK_SIZE = 1 << 20
+PRIMARY_BITS = 12
+MAX_PRIMARY_BITS = 15
+FLUSH_BITS = 512
+
+
+def byte_frequencies(data, counts=None):
+    """
+    Adds the number of occurrences of every byte value in data to counts
+
+    :param data: bytes-like object
+    :param counts: list of 256 counts to update (a new one if None)
+    :return: counts
+    """
+    counts = counts if counts is not None else [0] * 256
+    if np is not None:
+        for value, count in enumerate(np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256).tolist()):
+            counts[value] += count
+    else:
+        for value, count in Counter(bytes(data)).items():
+            counts[value] += count
+
+    return counts
+
+
+def code_lengths_from_frequencies(counts, max_code_length=None):
+    """
+    :param counts: list of 256 byte counts
+    :param max_code_length: if given, the longest allowed code (at least 8), see package_merge_code_lengths
+    :return: list of 256 Huffman code lengths (0 for bytes with count 0)
+    """
+    frequencies = {value: count for value, count in enumerate(counts) if count}
+    lengths = [0] * 256
+    if frequencies and max_code_length is not None:
+        for value, length in package_merge_code_lengths(frequencies, max_code_length).items():
+            lengths[value] = length
+    elif frequencies:
+        for value, length in huffman_code_lengths(frequencies).items():
+            lengths[value] = length
+
+    return lengths
+
+
+def _canonical_table(code_lengths):
+    assert len(code_lengths) == 256, "Need one code length per byte value!"
+    assert max(code_lengths) < 256, "Code lengths must fit in one byte!"
+    return canonical_codes({value: length for value, length in enumerate(code_lengths) if length})
+
+
+class HuffmanEncoder:
+    def __init__(self, code_lengths):
+        """
+        :param code_lengths: list of 256 code lengths, e.g. from code_lengths_from_frequencies
+        """
+        self.code_lengths = list(code_lengths)
+        table = _canonical_table(self.code_lengths)
+        codes = [table.get(value, (0, 0)) for value in range(256)]
+
+        # pair_codes[b0 | b1 << 8] is the code of b0 followed by the code of b1 (b0 | b1 << 8 is how
+        # array("H") reads the two bytes on a little-endian machine)
+        self._pair_codes = [0] * 65536
+        self._pair_lengths = [0] * 65536
+        for b1, (code1, length1) in enumerate(codes):
+            for b0, (code0, length0) in enumerate(codes):
+                self._pair_codes[b0 | b1 << 8] = (code0 << length1) | code1
+                self._pair_lengths[b0 | b1 << 8] = length0 + length1
+        self._codes = codes
+
+        self._accumulator = 0  # pending bits, the lowest self._bits bits of it
+        self._bits = 0
+        self._odd_byte = b""  # a byte left over from the previous chunk (bytes are encoded in pairs)
+
+
+    @classmethod
+    def from_data(cls, data, max_code_length=None):
+        """
+        Encoder for the byte frequencies of data
+        """
+        return cls(code_lengths_from_frequencies(byte_frequencies(data), max_code_length))
+
+
+    def encode(self, chunk):
+        """
+        Encodes a chunk of bytes
+
+        :return: the bytes of the bitstream that are complete so far
+        """
+
+        data = self._odd_byte + bytes(chunk)
+        self._odd_byte = data[-1:] if len(data) % 2 else b""
+
+        pairs = array("H")
+        pairs.frombytes(data[:len(data) - len(self._odd_byte)])
+        if sys.byteorder == "big":
+            pairs.byteswap()
+
+        output = bytearray()
+        accumulator, bits = self._accumulator, self._bits
+        pair_codes, pair_lengths = self._pair_codes, self._pair_lengths
+        for pair in pairs:
+            length = pair_lengths[pair]
+            accumulator = (accumulator << length) | pair_codes[pair]
+            bits += length
+            if bits >= FLUSH_BITS:
+                # emit all whole bytes, keep the remaining bits
+                extra = bits & 7
+                output += (accumulator >> extra).to_bytes((bits - extra) >> 3, "big")
+                accumulator &= (1 << extra) - 1
+                bits = extra
+
+        extra = bits & 7
+        output += (accumulator >> extra).to_bytes((bits - extra) >> 3, "big")
+        self._accumulator, self._bits = accumulator & ((1 << extra) - 1), extra
+        return bytes(output)
+
+
+    def flush(self):
+        """
+        Encodes the leftover byte and pads the bitstream to whole bytes
+
+        :return: the last bytes of the bitstream
+        """
+        if self._odd_byte:
+            code, length = self._codes[self._odd_byte[0]]
+            self._accumulator = (self._accumulator << length) | code
+            self._bits += length
+            self._odd_byte = b""
+
+        padding = -self._bits % 8
+        output = (self._accumulator << padding).to_bytes((self._bits + padding) >> 3, "big")
+        self._accumulator, self._bits = 0, 0
+        return output
+
+
+class HuffmanDecoder:
+    def __init__(self, code_lengths, length):
+        """
+        :param code_lengths: list of 256 code lengths, the same as the encoder's
+        :param length: number of bytes to decode (the padding bits after them are ignored)
+        """
+        self.code_lengths = list(code_lengths)
+        self.remaining = length
+        table = _canonical_table(self.code_lengths)
+        self.max_length = max(self.code_lengths)
+        self.primary_bits = primary_bits = min(max(self.max_length, PRIMARY_BITS), MAX_PRIMARY_BITS)
+
+        # primary table: the next primary_bits bits -> byte and code length (length 0: the code is longer)
+        self._symbols = bytearray(1 << primary_bits)
+        self._lengths = bytearray(1 << primary_bits)
+        # canonical decoding of the longer codes: per length, its first code, and the index of its first
+        # byte in the list of all bytes sorted by (code length, byte)
+        self._first_code = {}
+        self._first_index = {}
+        self._sorted_symbols = sorted(table, key=lambda value: (table[value][1], value))
+        self._counts = Counter(length for _, length in table.values())
+
+        for index, value in enumerate(self._sorted_symbols):
+            code, length = table[value]
+            if length not in self._first_code:
+                self._first_code[length] = code
+                self._first_index[length] = index
+            if length <= primary_bits:
+                start = code << (primary_bits - length)
+                for entry in range(start, start + (1 << (primary_bits - length))):
+                    self._symbols[entry] = value
+                    self._lengths[entry] = length
+
+        # multi-symbol table: all codes that fit completely in the next primary_bits bits -> (bytes, bits used)
+        self._multi_symbols = []
+        self._multi_bits = []
+        for index in range(1 << primary_bits):
+            decoded, used = bytearray(), 0
+            while True:
+                entry = (index << used) & ((1 << primary_bits) - 1)
+                length = self._lengths[entry]
+                if not length or used + length > primary_bits:
+                    break
+                decoded.append(self._symbols[entry])
+                used += length
+            self._multi_symbols.append(bytes(decoded))
+            self._multi_bits.append(used)
+
+        self._accumulator = 0
+        self._bits = 0
+
+
+    def _decode_long(self, accumulator, bits):
+        """
+        Canonical decoding of a code longer than primary_bits from the highest of the bits pending bits
+
+        :return: (byte, code length), or None if more bits are needed
+        """
+        for length in range(self.primary_bits + 1, self.max_length + 1):
+            if length > bits:
+                return None
+            if length in self._first_code:
+                offset = (accumulator >> (bits - length)) - self._first_code[length]
+                if 0 <= offset < self._counts[length]:
+                    return self._sorted_symbols[self._first_index[length] + offset], length
+
+        raise ValueError("Invalid Huffman bitstream!")
+
+
+    def decode(self, chunk, final=False):
+        """
+        Decodes a chunk of the bitstream
+
+        :param final: True for the last chunk (the codes in the last bits are decoded even if fewer than
+                      primary_bits bits are left)
+        :return: the decoded bytes
+        """
+
+        output = bytearray()
+        accumulator, bits = self._accumulator, self._bits
+        symbols, lengths = self._symbols, self._lengths
+        multi_symbols, multi_bits = self._multi_symbols, self._multi_bits
+        primary_bits = self.primary_bits
+        mask = (1 << primary_bits) - 1
+        remaining = self.remaining
+        data = bytes(chunk)
+        position = 0
+        refill = False
+
+        while remaining:
+            if (bits < 64 or refill) and position < len(data):
+                # refill 16 bytes at a time and drop the consumed bits, so the accumulator stays small
+                piece = data[position:position + 16]
+                accumulator = ((accumulator & ((1 << bits) - 1)) << (8 * len(piece))) | int.from_bytes(piece, "big")
+                bits += 8 * len(piece)
+                position += len(piece)
+                refill = False
+
+            # fast path: every lookup decodes all the codes that fit in the next primary_bits bits
+            while bits >= primary_bits:
+                index = (accumulator >> (bits - primary_bits)) & mask
+                decoded = multi_symbols[index]
+                if not decoded or len(decoded) > remaining:
+                    break
+                output += decoded
+                bits -= multi_bits[index]
+                remaining -= len(decoded)
+            if bits < 64 and position < len(data) or not remaining:
+                continue
+
+            if bits >= primary_bits:
+                index = (accumulator >> (bits - primary_bits)) & mask
+            elif final and bits and position == len(data):
+                index = (accumulator << (primary_bits - bits)) & mask  # pad the last bits with 0
+            else:
+                break
+
+            length = lengths[index]
+            if length and length <= bits:
+                output.append(symbols[index])
+                bits -= length
+                remaining -= 1
+                continue
+
+            decoded = None if length else self._decode_long(accumulator & ((1 << bits) - 1), bits)
+            if decoded is None:
+                if position < len(data):
+                    refill = True
+                    continue
+                if final:
+                    raise ValueError("Huffman bitstream ended early!")
+                break
+            output.append(decoded[0])
+            bits -= decoded[1]
+            remaining -= 1
+
+        self._accumulator, self._bits = accumulator & ((1 << bits) - 1), bits
+        self.remaining = remaining
+        return bytes(output)
+
+
+def compress(source, destination, chunk_size=CHUNK_SIZE, max_code_length=None):
+    """
+    Compresses the file object source into the file object destination, chunk_size bytes at a time
+
+    :param source: seekable binary file object (read twice: frequencies, then codes), read from its current position
+    :param destination: binary file object
+    :param max_code_length: if given, the longest allowed code (e.g. 12 so the decoder needs one 4096 entry table)
+    :return: (number of bytes read, number of bytes written)
+    """
+
+    start = source.tell()
+    counts = [0] * 256
+    length = 0
+    while chunk := source.read(chunk_size):
+        byte_frequencies(chunk, counts)
+        length += len(chunk)
+
+    code_lengths = code_lengths_from_frequencies(counts, max_code_length)
+    destination.write(HEADER.pack(MAGIC, length, bytes(code_lengths)))
+    written = HEADER.size
+
+    source.seek(start)
+    encoder = HuffmanEncoder(code_lengths)
+    while chunk := source.read(chunk_size):
+        written += destination.write(encoder.encode(chunk))
+    written += destination.write(encoder.flush())
+
+    return length, written
+
+
+def decompress(source, destination, chunk_size=CHUNK_SIZE):
+    """
+    Decompresses the file object source (written by compress) into the file object destination
+
+    :return: number of bytes written
+    """
+
+    header = source.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Not a Huffman compressed file: too short!")
+    magic, length, code_lengths = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a Huffman compressed file: bad magic " + str(magic))
+
+    decoder = HuffmanDecoder(code_lengths, length)
+    written = 0
+    chunk = source.read(chunk_size)
+    while decoder.remaining:
+        next_chunk = source.read(chunk_size)
+        written += destination.write(decoder.decode(chunk, final=not next_chunk))
+        if not next_chunk:
+            break
+        chunk = next_chunk
+
+    if decoder.remaining:
+        raise ValueError("Huffman bitstream ended early!")
+    return written
+
+
+def compress_bytes(data, max_code_length=None):
+    source, destination = io.BytesIO(data), io.BytesIO()
+    compress(source, destination, max_code_length=max_code_length)
+    return destination.getvalue()
+
+
+def decompress_bytes(data):
+    source, destination = io.BytesIO(data), io.BytesIO()
+    decompress(source, destination)
+    return destination.getvalue()
+
+
+if __name__ == "__main__":
+    text = b"this is an example of a huffman tree " * 100
+    compressed = compress_bytes(text)
+    print(len(text), "bytes ->", len(compressed), "bytes")
+    print("round trip:", decompress_bytes(compressed) == text)
@@ -1,7 +1,11 @@
+import gc
+import itertools
 import math 
 
 
 class BinaryTreeNode:
+    __slots__ = ("value", "left_child", "right_child", "bit", "id", "prime")
+
     def __init__(self, value, id=None, prime=0):
         self.value = value
         self.left_child = None
@@ -82,50 +86,288 @@ def efficiency(H, K):
     return H / K
 
 
-# sample inputs (probabilities)
-symb_num = int(input("How many symbols need to be encoded? "))
-X = []
-for j in range(symb_num):
-    prob_value = float(input("Enter Probability for X" + str(j + 1) + ": "))
-    X.append(BinaryTreeNode(value=prob_value, id=j+1))
-
-# iterator i for id 
-i = len(X) + 1
-# save copy of X's length
-X_len = len(X)
-# save a copy of X for later use 
-X_copy = X.copy()
-
-while len(X) >= 2: 
-    # ensure X is sorted (descending order)
-    X.sort(key=lambda x: (x.value, x.prime), reverse=True)
-
-    # for x in X:
-    #     print(x)
-    # print()
-
-    # replace last two nodes with another node: Xn
-    # Xn will have value of X[-1] + X[-2] 
-    # Xn will be parent of X[-1] and X[-2] 
-    Xn = BinaryTreeNode(X[-1].value + X[-2].value, id=X[-2].id, prime=1)
-    Xn.left_child = X[-1]
-    Xn.left_child.bit = "1" 
-    Xn.right_child = X[-2]
-    Xn.right_child.bit = "0"
-    
-    X[-2:] = [Xn]
-    i += 1
+def _huffman_merges(frequencies):
+    """
+    Runs the merges of build_huffman_tree on node numbers only: node k < n is the k-th leaf, node n + j
+    the j-th merged node, whose children are left[j] (the smallest node) and right[j]
+
+    :return: (items, values, left, right) where items are the (symbol, value) pairs of the leaves
+             and values the value of every node
+    """
+
+    items = list(frequencies.items() if hasattr(frequencies, "items") else enumerate(frequencies, start=1))
+    n = len(items)
+    assert n > 0, "Need at least one symbol to build a Huffman tree!"
+
+    values = [value for _, value in items]
+    left, right = [], []
+
+    # two queues instead of a heap: the leaves sorted once by (value, -number), and the merged nodes, which
+    # are created in order of non-decreasing value (each one is the sum of the two smallest remaining nodes),
+    # grouped into runs of equal value so the newest merged node of the smallest value is taken first
+    leaves = sorted(range(n - 1, -1, -1), key=values.__getitem__)
+    runs, run_values = [], []
+    next_leaf = next_run = 0
+
+    def take():
+        nonlocal next_leaf, next_run
+        # leaves before merged nodes on ties
+        if next_run < len(runs) and (next_leaf == n or run_values[next_run] < values[leaves[next_leaf]]):
+            run = runs[next_run]
+            k = run.pop()
+            if not run:
+                next_run += 1
+            return k
+        next_leaf += 1
+        return leaves[next_leaf - 1]
+
+    for k in range(n, 2 * n - 1):
+        i = take()
+        j = take()
+        value = values[i] + values[j]
+        values.append(value)
+        left.append(i)
+        right.append(j)
+        if next_run < len(runs) and run_values[-1] == value:
+            runs[-1].append(k)
+        else:
+            runs.append([k])
+            run_values.append(value)
+
+    return items, values, left, right
+
+
+def build_huffman_tree(frequencies):
+    """
+    Builds the Huffman tree of the given symbol frequencies (or probabilities) in O(n log n): one sort, then
+    n - 1 merges in O(1) each
+
+    :param frequencies: mapping {symbol: frequency}, the symbol becomes the id of its leaf,
+                        or a sequence of frequencies, whose leaves get the ids 1, 2, ..., n
+    :return: the root BinaryTreeNode
+
+    The two nodes with the smallest values are merged until one node is left, the merged node
+    Xn gets the value of both, the id of the second node and prime = 1:
+        the smallest node becomes the left child with bit "1", the second smallest the right child with bit "0"
+    Ties between equal values are broken deterministically: leaves before merged nodes, then newer nodes first
+    (leaves by descending id), which gives the same tree as the original sort-on-every-merge loop.
+
+    Speed: for 65536 symbols this takes about 0.2 - 0.6 s in CPython (plus about 0.25 s for code_table), most of it
+    creating the 2n - 1 BinaryTreeNode objects. When only the code lengths are needed, huffman_code_lengths skips
+    the tree.
+    """
+
+    # the merges only record node numbers, the BinaryTreeNodes are created in one pass at the end
+    items, values, left, right = _huffman_merges(frequencies)
+    n = len(items)
+
+    # the 2n - 1 nodes are all new and none can be garbage yet, so the cyclic garbage collector would only
+    # rescan them over and over while they are allocated
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        nodes = [BinaryTreeNode(value=value, id=symbol) for symbol, value in items]
+        for i, j, value in zip(left, right, values[n:]):
+            smallest, second = nodes[i], nodes[j]
+            Xn = BinaryTreeNode(value, id=second.id, prime=1)
+            Xn.left_child = smallest
+            smallest.bit = "1"
+            Xn.right_child = second
+            second.bit = "0"
+            nodes.append(Xn)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return nodes[-1]
+
+
+def huffman_code_lengths(frequencies):
+    """
+    Code lengths of the Huffman tree of build_huffman_tree, computed from the merges without creating the tree
+
+    :param frequencies: as for build_huffman_tree
+    :return: {symbol: code length} (a single symbol gets length 1), e.g. for canonical_codes
+    """
+
+    items, _, left, right = _huffman_merges(frequencies)
+    n = len(items)
+    if n == 1:
+        return {items[0][0]: 1}
+
+    # a merged node is always created after its children, so going backwards every parent's depth is known
+    depths = [0] * (2 * n - 1)
+    for j in range(n - 2, -1, -1):
+        depth = depths[n + j] + 1
+        depths[left[j]] = depth
+        depths[right[j]] = depth
+
+    return {symbol: depth for (symbol, _), depth in zip(items, depths)}
+
+
+def code_table(root):
+    """
+    Collects the code of every leaf in one iterative traversal of the tree (no per-symbol searches, no recursion)
+
+    :param root: root BinaryTreeNode, e.g. from build_huffman_tree
+    :return: {symbol id: (code, length)} where code is the int whose length-bit binary form is the path of bits
+             from the root (a tree of a single leaf gets the code 0 of length 1)
+    """
+
+    if root.left_child is None and root.right_child is None:
+        return {root.id: (0, 1)}
+
+    table = {}
+    stack = [(root, 0, 0)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, code, length = pop()
+        left, right = node.left_child, node.right_child
+        if left is None and right is None:
+            table[node.id] = (code, length)
+            continue
+        code <<= 1
+        length += 1
+        if right is not None:
+            push((right, code | (right.bit == "1"), length))
+        if left is not None:
+            push((left, code | (left.bit == "1"), length))
+
+    return table
+
+
+def canonical_codes(code_lengths):
+    """
+    Assigns canonical Huffman codes: symbols sorted by (length, symbol) get consecutive codes, and the code is
+    shifted left whenever the length grows. Only the code lengths are needed to rebuild the same codes.
+
+    :param code_lengths: {symbol: code length}, e.g. {s: length for s, (_, length) in code_table(root).items()}
+    :return: {symbol: (code, length)}
+    """
+
+    table = {}
+    code = 0
+    previous_length = 0
+    for symbol, length in sorted(code_lengths.items(), key=lambda item: (item[1], item[0])):
+        code <<= length - previous_length
+        table[symbol] = (code, length)
+        code += 1
+        previous_length = length
+
+    return table
+
+
+def code_statistics(frequencies, table):
+    """
+    Entropy H, average code length K and code efficiency H / K of a code table
+
+    :param frequencies: mapping {symbol: frequency} or sequence (symbols 1, 2, ..., n) as for build_huffman_tree
+    :param table: {symbol: (code, length)} from code_table or canonical_codes
+    :return: (H, K, efficiency)
+    """
+
+    items = frequencies.items() if hasattr(frequencies, "items") else enumerate(frequencies, start=1)
+    symbols, weights = zip(*items)
+    total = sum(weights)
+    probabilities = [w / total for w in weights]
+
+    entropy = H([p for p in probabilities if p > 0])
+    average_length = K(probabilities, [table[symbol][1] for symbol in symbols])
+    return entropy, average_length, efficiency(entropy, average_length)
+
+
+def package_merge_code_lengths(frequencies, max_code_length):
+    """
+    Optimal code lengths with no code longer than max_code_length (package-merge algorithm)
+
+    :param frequencies: mapping {symbol: frequency} or sequence (symbols 1, 2, ..., n) as for build_huffman_tree
+    :param max_code_length: longest allowed code, 2 ** max_code_length must be at least the number of symbols
+    :return: {symbol: code length}, e.g. for canonical_codes
+
+    Every symbol is a coin of width 2^-l for every level l = 1 .. max_code_length, with its frequency as value.
+    Starting at the deepest level, the sorted coins of a level are paired into packages (value = sum of both),
+    which are merged with the coins of the next level up. The 2n - 2 cheapest items of the top level form the
+    cheapest set of coins of total width n - 1, and the code length of a symbol is the number of its coins in it.
+    The result is the same as Huffman's whenever the Huffman code already respects the limit.
+    """
+
+    items = frequencies.items() if hasattr(frequencies, "items") else enumerate(frequencies, start=1)
+    symbols = sorted(items, key=lambda item: item[1])
+    n = len(symbols)
+    assert n > 0, "Need at least one symbol to build a code!"
+    assert 2 ** max_code_length >= n, "max_code_length is too small for " + str(n) + " symbols!"
+    if n == 1:
+        return {symbols[0][0]: 1}
+
+    # the items of a level are (value, 0) for a coin and (value, 1) for a package, sorted, coins first on ties
+    coins = [(value, 0) for _, value in symbols]
+    levels = []  # is-package flags of the sorted items of every level, from the deepest one up
+    values = [value for _, value in symbols]
+    for _ in range(max_code_length - 1):
+        packages = [(values[k] + values[k + 1], 1) for k in range(0, len(values) - 1, 2)]
+        # a sort of two sorted runs is a linear merge; only the 2n - 2 cheapest items can ever be chosen
+        level = sorted(coins + packages)[:2 * n - 2]
+        values = [value for value, _ in level]
+        levels.append([is_package for _, is_package in level])
+
+    # the coins chosen on a level are always the cheapest ones, so only their number is needed: going down,
+    # the chosen packages of a level are made of the 2 x (number of packages) cheapest items of the level below
+    lengths = [0] * (n + 1)
+    chosen = 2 * n - 2
+    for is_package in reversed(levels):
+        packages = sum(is_package[:chosen])
+        lengths[chosen - packages] -= 1  # the symbols 0 .. chosen - packages - 1 get one more bit
+        lengths[0] += 1
+        chosen = 2 * packages
+    lengths[chosen] -= 1  # deepest level: coins only
+    lengths[0] += 1
+    lengths = list(itertools.accumulate(lengths))
+
+    return {symbol: lengths[index] for index, (symbol, _) in enumerate(symbols)}
+
+
+def length_limit_report(frequencies, max_code_length):
+    """
+    Compares the length-limited code with the unconstrained Huffman code of the same frequencies
+
+    :return: dict with the longest code, K and efficiency of both codes, and the loss in K (bits / symbol) and efficiency
+    """
+
+    unconstrained = canonical_codes(huffman_code_lengths(frequencies))
+    limited = canonical_codes(package_merge_code_lengths(frequencies, max_code_length))
+
+    _, K_unconstrained, efficiency_unconstrained = code_statistics(frequencies, unconstrained)
+    _, K_limited, efficiency_limited = code_statistics(frequencies, limited)
+    return {"max_length_unconstrained": max(length for _, length in unconstrained.values()),
+            "max_length_limited": max(length for _, length in limited.values()),
+            "K_unconstrained": K_unconstrained, "K_limited": K_limited, "K_loss": K_limited - K_unconstrained,
+            "efficiency_unconstrained": efficiency_unconstrained, "efficiency_limited": efficiency_limited,
+            "efficiency_loss": efficiency_unconstrained - efficiency_limited}
+
+
+def code_string(code, length):
+    return format(code, "0" + str(length) + "b") if length else ""
+
+
+def main():
+    # sample inputs (probabilities)
+    symb_num = int(input("How many symbols need to be encoded? "))
+    probabilities = []
+    for j in range(symb_num):
+        probabilities.append(float(input("Enter Probability for X" + str(j + 1) + ": ")))
+
+    root = build_huffman_tree(probabilities)
+    table = code_table(root)
+    canonical = canonical_codes({symbol: length for symbol, (_, length) in table.items()})
 
-code_lengths = [] 
+    for j in range(symb_num):
+        print("X" + str(j + 1) + ":", code_string(*table[j + 1]), "canonical:", code_string(*canonical[j + 1]))
 
-for j in range(X_len):
-    print("X" + str(j + 1) + ":", end=" ")
-    code_lengths.append(len(print_path(X[0], j + 1)) - 1)  # also prints the path 
+    entropy, average_length, code_efficiency = code_statistics(probabilities, table)
+    print("H(X) in bits/symbol:", str(entropy))
+    print("K in number of bits:", str(average_length))
+    print("Code Efficiency:", str(code_efficiency))
 
-# print(X[0])
-H = H([x.value for x in X_copy])
-K = K([x.value for x in X_copy], code_lengths)
-print("H(X) in bits/symbol:", str(H))
-print("K in number of bits:", str(K))
-print("Code Efficiency:", str(efficiency(H, K)))
 
+if __name__ == "__main__":
+    main()
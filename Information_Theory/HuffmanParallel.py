@@ -0,0 +1,254 @@
+from HuffmanCoding import canonical_codes
+from HuffmanCodec import HuffmanDecoder, code_lengths_from_frequencies
+from concurrent.futures import ProcessPoolExecutor
+import os
+import struct
+import numpy as np
+
+
+"""
+Parallel chunked Huffman compression
+
+    1. Frequencies: the input file is memory-mapped (np.memmap) and split into blocks, every worker process
+       counts the bytes of its blocks with np.bincount, the parent adds the counts up and builds ONE code table
+    2. Encoding: the input is split into chunks of chunk_size bytes, which are encoded independently by the worker
+       processes with numpy (see encode_chunk): every chunk is a complete bitstream padded to whole bytes
+    3. Container: the chunks are written in order after a header and a chunk index, so every chunk can be
+       located and decoded on its own: decompression runs in parallel, and read_range only decodes the chunks
+       overlapping the requested bytes
+
+Container format (integers little-endian):
+    header:      PARALLEL_MAGIC, original length (uint64), chunk size (uint64), number of chunks (uint64),
+                 256 code lengths (one byte each)
+    chunk index: per chunk, the offset of its bitstream from the start of the file and its size in bytes (2 x uint64)
+    chunks:      the bitstream of every chunk (the format of HuffmanCodec without its header)
+"""
+
+PARALLEL_MAGIC = b"PAVEHUFP"
+PARALLEL_HEADER = struct.Struct("<8sQQQ256s")
+INDEX_ENTRY = struct.Struct("<QQ")
+PARALLEL_CHUNK_SIZE = 1 << 22
+COUNT_BLOCK_SIZE = 1 << 24
+ENCODE_BLOCK_SIZE = 1 << 18
+MAX_CODE_LENGTH = 64
+
+
+def _count_block(path, start, stop):
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    counts = np.zeros(256, dtype=np.int64)
+    # bincount converts its input to intp, so it is fed in blocks to keep that copy small
+    for block_start in range(start, stop, COUNT_BLOCK_SIZE // 4):
+        counts += np.bincount(data[block_start:min(block_start + COUNT_BLOCK_SIZE // 4, stop)], minlength=256)
+    del data
+    return counts
+
+
+def count_frequencies_parallel(path, workers=None, executor=None):
+    """
+    Counts the byte values of the file at path with np.bincount over a memory map, COUNT_BLOCK_SIZE bytes per task
+
+    :param workers: number of worker processes (defaults to the number of CPUs)
+    :param executor: existing ProcessPoolExecutor to use instead of starting one
+    :return: list of 256 counts
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return [0] * 256
+
+    blocks = [(start, min(start + COUNT_BLOCK_SIZE, size)) for start in range(0, size, COUNT_BLOCK_SIZE)]
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            return count_frequencies_parallel(path, executor=executor)
+
+    counts = np.zeros(256, dtype=np.int64)
+    for block_counts in executor.map(_count_block, [path] * len(blocks), *zip(*blocks)):
+        counts += block_counts
+    return counts.tolist()
+
+
+def _code_arrays(code_lengths):
+    """
+    :return: (bits, lengths) where bits[b] holds the code bits of byte b (first bit first, padded with 0 to the
+             longest code) and lengths[b] its code length
+    """
+    table = canonical_codes({value: length for value, length in enumerate(code_lengths) if length})
+    max_length = max(code_lengths) if any(code_lengths) else 1
+    assert max_length <= MAX_CODE_LENGTH, "Code lengths above " + str(MAX_CODE_LENGTH) + " are not supported!"
+
+    bits = np.zeros((256, max_length), dtype=np.uint8)
+    for value, (code, length) in table.items():
+        for j in range(length):
+            bits[value, j] = (code >> (length - 1 - j)) & 1
+    return bits, np.array(code_lengths, dtype=np.int64)
+
+
+def encode_chunk(data, code_lengths, code_arrays=None):
+    """
+    Encodes bytes with numpy: the code bits of every byte are gathered from a (256 x longest code) table,
+    the padding after each code is masked out and the bits are packed with np.packbits.
+    Gives the same bitstream as HuffmanEncoder (encode + flush).
+
+    :param data: bytes-like object or uint8 ndarray
+    :param code_lengths: list of 256 code lengths
+    :param code_arrays: result of _code_arrays(code_lengths), to reuse it between chunks
+    :return: bytes
+    """
+
+    bits_table, lengths = code_arrays if code_arrays is not None else _code_arrays(code_lengths)
+    data = np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray) else data
+    positions = np.arange(bits_table.shape[1])
+
+    pieces = []
+    for start in range(0, len(data), ENCODE_BLOCK_SIZE):
+        block = data[start:start + ENCODE_BLOCK_SIZE]
+        pieces.append(bits_table[block][positions < lengths[block][:, None]])
+
+    return np.packbits(np.concatenate(pieces)).tobytes() if pieces else b""
+
+
+def _encode_part(path, start, stop, code_lengths):
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    encoded = encode_chunk(np.array(data[start:stop]), code_lengths)
+    del data
+    return encoded
+
+
+def _decode_part(source_path, offset, size, length, code_lengths, destination_path, destination_offset):
+    with open(source_path, "rb") as source:
+        source.seek(offset)
+        data = source.read(size)
+    decoded = HuffmanDecoder(code_lengths, length).decode(data, final=True)
+    with open(destination_path, "r+b") as destination:
+        destination.seek(destination_offset)
+        destination.write(decoded)
+    return len(decoded)
+
+
+def _bounded_map(executor, function, arguments, window):
+    """
+    executor.map that keeps at most window tasks in flight, so finished results do not pile up in memory
+    """
+    pending = []
+    for argument in arguments:
+        pending.append(executor.submit(function, *argument))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+def compress_parallel(source_path, destination_path, chunk_size=PARALLEL_CHUNK_SIZE, workers=None, max_code_length=None):
+    """
+    Compresses the file source_path into a chunked container at destination_path using a pool of processes
+
+    :param chunk_size: number of input bytes per independently decodable chunk
+    :param workers: number of worker processes (defaults to the number of CPUs)
+    :param max_code_length: if given, the longest allowed code, see HuffmanCodec.compress
+    :return: (number of bytes read, number of bytes written)
+    """
+
+    assert chunk_size > 0, "chunk_size must be positive"
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(source_path)
+    chunks = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        counts = count_frequencies_parallel(source_path, executor=executor)
+        code_lengths = code_lengths_from_frequencies(counts, max_code_length)
+
+        with open(destination_path, "wb") as destination:
+            destination.write(PARALLEL_HEADER.pack(PARALLEL_MAGIC, size, chunk_size, len(chunks), bytes(code_lengths)))
+            destination.write(bytes(INDEX_ENTRY.size * len(chunks)))  # filled in below
+
+            index = []
+            offset = PARALLEL_HEADER.size + INDEX_ENTRY.size * len(chunks)
+            arguments = [(source_path, start, stop, code_lengths) for start, stop in chunks]
+            for encoded in _bounded_map(executor, _encode_part, arguments, 2 * workers):
+                destination.write(encoded)
+                index.append(INDEX_ENTRY.pack(offset, len(encoded)))
+                offset += len(encoded)
+
+            destination.seek(PARALLEL_HEADER.size)
+            destination.write(b"".join(index))
+
+    return size, offset
+
+
+def read_index(source):
+    """
+    Reads the header and chunk index of a container
+
+    :param source: binary file object positioned at the start of the container
+    :return: (original length, chunk size, code lengths, [(offset, size) per chunk])
+    """
+    header = source.read(PARALLEL_HEADER.size)
+    if len(header) < PARALLEL_HEADER.size:
+        raise ValueError("Not a parallel Huffman container: too short!")
+    magic, length, chunk_size, number_of_chunks, code_lengths = PARALLEL_HEADER.unpack(header)
+    if magic != PARALLEL_MAGIC:
+        raise ValueError("Not a parallel Huffman container: bad magic " + str(magic))
+
+    index_bytes = source.read(INDEX_ENTRY.size * number_of_chunks)
+    if len(index_bytes) < INDEX_ENTRY.size * number_of_chunks:
+        raise ValueError("Parallel Huffman container: truncated chunk index!")
+    index = [INDEX_ENTRY.unpack_from(index_bytes, k * INDEX_ENTRY.size) for k in range(number_of_chunks)]
+    return length, chunk_size, list(code_lengths), index
+
+
+def decompress_parallel(source_path, destination_path, workers=None):
+    """
+    Decompresses a container written by compress_parallel, every worker decodes whole chunks and writes them
+    straight to their place in destination_path
+
+    :return: number of bytes written
+    """
+
+    with open(source_path, "rb") as source:
+        length, chunk_size, code_lengths, index = read_index(source)
+
+    with open(destination_path, "wb") as destination:
+        destination.truncate(length)
+
+    workers = workers or os.cpu_count() or 1
+    arguments = [(source_path, offset, size, min(chunk_size, length - k * chunk_size), code_lengths,
+                  destination_path, k * chunk_size) for k, (offset, size) in enumerate(index)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(_bounded_map(executor, _decode_part, arguments, 2 * workers))
+
+
+def read_range(source_path, start, stop):
+    """
+    Random access: returns the original bytes start .. stop - 1, decoding only the chunks that overlap them
+    """
+
+    with open(source_path, "rb") as source:
+        length, chunk_size, code_lengths, index = read_index(source)
+        start, stop = max(start, 0), min(stop, length)
+        if start >= stop:
+            return b""
+
+        decoded = bytearray()
+        first, last = start // chunk_size, (stop - 1) // chunk_size
+        for k in range(first, last + 1):
+            offset, size = index[k]
+            source.seek(offset)
+            chunk_length = min(chunk_size, length - k * chunk_size)
+            decoded += HuffmanDecoder(code_lengths, chunk_length).decode(source.read(size), final=True)
+
+    return bytes(decoded[start - first * chunk_size:stop - first * chunk_size])
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, name) for name in ("input.txt", "compressed.hufp", "restored.txt")]
+        text = b"".join(b"line %d: the quick brown fox jumps over the lazy dog\n" % i for i in range(200000))
+        with open(paths[0], "wb") as f:
+            f.write(text)
+
+        print("compressed:", compress_parallel(paths[0], paths[1], chunk_size=1 << 20))
+        print("restored:", decompress_parallel(paths[1], paths[2]), "bytes")
+        with open(paths[2], "rb") as f:
+            print("round trip:", f.read() == text)
+        print("random access:", read_range(paths[1], 1234567, 1234600) == text[1234567:1234600])
@@ -0,0 +1,57 @@
+import io
+import pytest
+import random
+from HuffmanCodec import *
+
+
+def fibonacci_data(number_of_symbols):
+    """
+    Byte i occurs fib(i) times, which gives the deepest possible Huffman code (number_of_symbols - 1 bits)
+    """
+    counts = [1, 1]
+    while len(counts) < number_of_symbols:
+        counts.append(counts[-1] + counts[-2])
+    data = bytearray()
+    for value, count in enumerate(counts):
+        data += bytes([value]) * count
+    random.Random(0).shuffle(data)
+    return bytes(data)
+
+
+DATA = {"empty": b"", "single": b"a" * 1000, "text": b"this is an example of a huffman tree " * 50,
+        "fibonacci": fibonacci_data(20)}
+
+
+@pytest.mark.parametrize("name", DATA)
+@pytest.mark.parametrize("chunk_size", [1, 7, CHUNK_SIZE])
+def test_round_trip(name, chunk_size):
+    data = DATA[name]
+    compressed = io.BytesIO()
+    assert compress(io.BytesIO(data), compressed, chunk_size=chunk_size) == (len(data), len(compressed.getvalue()))
+    assert compressed.getvalue() == compress_bytes(data)
+
+    restored = io.BytesIO()
+    assert decompress(io.BytesIO(compressed.getvalue()), restored, chunk_size=chunk_size) == len(data)
+    assert restored.getvalue() == data
+
+
+def test_deep_codes():
+    code_lengths = code_lengths_from_frequencies(byte_frequencies(DATA["fibonacci"]))
+    assert max(code_lengths) == 19 > MAX_PRIMARY_BITS
+    assert decompress_bytes(compress_bytes(DATA["fibonacci"])) == DATA["fibonacci"]
+
+
+def test_truncated():
+    compressed = compress_bytes(DATA["text"])
+    with pytest.raises(ValueError):
+        decompress_bytes(compressed[:-3])
+    with pytest.raises(ValueError):
+        decompress_bytes(b"PAVEHUF0" + compressed[8:])
+
+
+@pytest.mark.parametrize("max_code_length", [8, 12, 15])
+def test_length_limited(max_code_length):
+    compressed = compress_bytes(DATA["fibonacci"], max_code_length=max_code_length)
+    _, _, code_lengths = HEADER.unpack_from(compressed)
+    assert max(code_lengths) == max_code_length
+    assert decompress_bytes(compressed) == DATA["fibonacci"]
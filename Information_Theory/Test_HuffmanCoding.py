@@ -0,0 +1,109 @@
+import itertools
+import pytest
+import random
+from fractions import Fraction
+from HuffmanCoding import *
+
+
+def test_package_merge():
+    rng = random.Random(0)
+    for n in range(2, 7):
+        for _ in range(10):
+            frequencies = {symbol: rng.choice([1, 1, 2, 3, 5, 8, 40, 100]) for symbol in range(n)}
+            for max_code_length in range((n - 1).bit_length(), n):
+                lengths = package_merge_code_lengths(frequencies, max_code_length)
+                assert max(lengths.values()) <= max_code_length
+                assert sum(Fraction(1, 2 ** length) for length in lengths.values()) <= 1
+
+                # brute force: the cheapest of all length vectors within the limit that satisfy Kraft's inequality
+                best = min(sum(frequencies[symbol] * length for symbol, length in enumerate(candidate))
+                           for candidate in itertools.product(range(1, max_code_length + 1), repeat=n)
+                           if sum(2 ** (max_code_length - length) for length in candidate) <= 2 ** max_code_length)
+                assert sum(frequencies[symbol] * length for symbol, length in lengths.items()) == best
+
+
+def _baseline_huffman_tree(frequencies):
+    """
+    The original algorithm: sort the nodes (descending) before every merge and merge the last two
+    """
+    items = frequencies.items() if hasattr(frequencies, "items") else enumerate(frequencies, start=1)
+    X = [BinaryTreeNode(value=value, id=symbol) for symbol, value in items]
+    while len(X) >= 2:
+        X.sort(key=lambda x: (x.value, x.prime), reverse=True)
+        Xn = BinaryTreeNode(X[-1].value + X[-2].value, id=X[-2].id, prime=1)
+        Xn.left_child = X[-1]
+        Xn.left_child.bit = "1"
+        Xn.right_child = X[-2]
+        Xn.right_child.bit = "0"
+        X[-2:] = [Xn]
+    return X[0]
+
+
+def _tree_nodes(root):
+    nodes, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        nodes.append((node.value, node.id, node.prime, node.bit))
+        stack.extend(child for child in (node.right_child, node.left_child) if child is not None)
+    return nodes
+
+
+def test_build_huffman_tree():
+    rng = random.Random(21)
+    for t in range(400):
+        n = rng.randint(1, 40)
+        if t % 4 == 0:
+            frequencies = {rng.randint(0, 10**6): rng.randint(0, 4) for _ in range(n)}
+        elif t % 4 == 1:
+            frequencies = [rng.random() for _ in range(n)]
+        elif t % 4 == 2:
+            frequencies = [Fraction(rng.randint(1, 3), rng.randint(1, 3)) for _ in range(n)]
+        else:
+            frequencies = [rng.choice([0.1, 0.2, 0.3]) for _ in range(n)]
+
+        root = build_huffman_tree(frequencies)
+        assert _tree_nodes(root) == _tree_nodes(_baseline_huffman_tree(frequencies))
+        assert huffman_code_lengths(frequencies) == {symbol: length for symbol, (_, length) in code_table(root).items()}
+
+
+def test_single_symbol():
+    root = build_huffman_tree({"a": 5})
+    assert code_table(root) == {"a": (0, 1)}
+    assert huffman_code_lengths({"a": 5}) == {"a": 1}
+
+
+def test_canonical_codes():
+    rng = random.Random(22)
+    for _ in range(200):
+        frequencies = {symbol: rng.randint(1, 1000) for symbol in range(rng.randint(2, 60))}
+        table = code_table(build_huffman_tree(frequencies))
+        canonical = canonical_codes({symbol: length for symbol, (_, length) in table.items()})
+
+        # same lengths, so the same average length and efficiency
+        assert {symbol: length for symbol, (_, length) in canonical.items()} == \
+               {symbol: length for symbol, (_, length) in table.items()}
+        assert code_statistics(frequencies, canonical) == code_statistics(frequencies, table)
+
+        # a complete code: Kraft's sum is exactly 1
+        assert sum(Fraction(1, 2 ** length) for _, length in canonical.values()) == 1
+
+        # prefix free: no code is the start of another one
+        codes = sorted(code_string(code, length) for code, length in canonical.values())
+        assert len(set(codes)) == len(codes)
+        assert not any(b.startswith(a) for a, b in zip(codes, codes[1:]))
+
+        # canonical order: codes increase with (length, symbol)
+        ordered = sorted(canonical, key=lambda symbol: (canonical[symbol][1], symbol))
+        values = [canonical[symbol][0] << (64 - canonical[symbol][1]) for symbol in ordered]
+        assert values == sorted(values)
+
+
+def test_code_statistics():
+    frequencies = {"a": 4, "b": 2, "c": 1, "d": 1}
+    table = code_table(build_huffman_tree(frequencies))
+    assert sorted(length for _, length in table.values()) == [1, 2, 3, 3]
+
+    entropy, average_length, code_efficiency = code_statistics(frequencies, table)
+    assert entropy == pytest.approx(1.75)
+    assert average_length == pytest.approx(1.75)
+    assert code_efficiency == pytest.approx(1)
@@ -0,0 +1,39 @@
+import pytest
+import random
+
+np = pytest.importorskip("numpy")
+
+from HuffmanCodec import HuffmanEncoder
+from HuffmanParallel import *
+
+
+def skewed_data(size, seed=0):
+    """
+    Bytes with geometrically decreasing frequencies, so the codes have many different lengths
+    """
+    rng = random.Random(seed)
+    return bytes(min(int(rng.expovariate(0.3)), 255) for _ in range(size))
+
+
+DATA = {"single": b"a" * 1000, "text": b"this is an example of a huffman tree " * 50, "skewed": skewed_data(20000)}
+
+
+@pytest.mark.parametrize("name", DATA)
+def test_encode_chunk(name):
+    data = DATA[name]
+    encoder = HuffmanEncoder.from_data(data)
+    assert encode_chunk(data, encoder.code_lengths) == encoder.encode(data) + encoder.flush()
+
+
+def test_read_range(tmp_path):
+    data = DATA["text"] + DATA["skewed"]
+    paths = [tmp_path / "input", tmp_path / "compressed", tmp_path / "restored"]
+    paths[0].write_bytes(data)
+    compress_parallel(paths[0], paths[1], chunk_size=4096, workers=2)
+
+    assert decompress_parallel(paths[1], paths[2], workers=2) == len(data)
+    assert paths[2].read_bytes() == data
+    rng = random.Random(0)
+    for start, stop in [(0, len(data)), (4095, 4097), (5, 5), (len(data) - 3, len(data) + 10), (-4, 3)] + \
+                       [sorted(rng.sample(range(len(data)), 2)) for _ in range(5)]:
+        assert read_range(paths[1], start, stop) == data[max(start, 0):stop]
@@ -0,0 +1,57 @@
+import argparse
+import os
+import time
+import numpy as np
+from Guass_Jordan_Elimination import rref_numpy, rref_blocked
+
+
+"""
+Blocked Gauss-Jordan Elimination Scaling Benchmark
+
+Times rref_blocked on random dense n x (n + 1) matrices with 1, 2, 4 and 8 threads, next to the unblocked
+"numpy" backend, and checks that both give the same pivots. The threads only help when there are free cores:
+numpy's BLAS may use several threads of its own, so for clean numbers pin it to one thread, e.g.
+    OPENBLAS_NUM_THREADS=1 OMP_NUM_THREADS=1 python Benchmark_Blocked_GJE.py
+
+Usage:
+    python Benchmark_Blocked_GJE.py [--sizes 1000 2000 5000] [--workers 1 2 4 8] [--block-size 64] [--skip-numpy]
+"""
+
+def time_it(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling of the blocked rref backend with the number of threads")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--block-size", type=int, default=64)
+    parser.add_argument("--skip-numpy", action="store_true", help="do not time the unblocked numpy backend")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print("CPUs:", os.cpu_count())
+    print(f"{'size':>11} {'engine':>10} {'workers':>8} {'seconds':>9} {'GFLOP/s':>8} {'speedup':>8}")
+    for n in args.sizes:
+        A = rng.standard_normal((n, n + 1))
+        flops = n * n * (n + 1)  # about n^3 multiply-adds for Gauss-Jordan
+
+        if not args.skip_numpy:
+            seconds, (_, pivots_numpy) = time_it(rref_numpy, A)
+            print(f"{n:>5}x{n + 1:<5} {'numpy':>10} {1:>8} {seconds:>9.2f} {2 * flops / seconds / 1e9:>8.2f} {'':>8}")
+        else:
+            pivots_numpy = None
+
+        baseline = None
+        for workers in args.workers:
+            seconds, (_, pivots) = time_it(rref_blocked, A, workers=workers, block_size=args.block_size)
+            assert pivots_numpy is None or pivots == pivots_numpy
+            baseline = baseline or seconds
+            print(f"{n:>5}x{n + 1:<5} {'blocked':>10} {workers:>8} {seconds:>9.2f} {2 * flops / seconds / 1e9:>8.2f} "
+                  f"{baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
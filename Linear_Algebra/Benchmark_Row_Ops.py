@@ -0,0 +1,95 @@
+import cProfile
+import pstats
+import random
+import sys
+import time
+from fractions import Fraction
+from Guass_Jordan_Elimination import rref, zeros_to_bottom, get_top_row, multiply_row, add_two_rows
+
+
+"""
+Row Operation Benchmark
+
+Compares the cost of one row operation (reducing one row by the pivot row) of the original rref loop, which
+calls multiply_row / add_two_rows (through multipledispatch) and allocates new rows, against the in-place
+kernel used by rref now. Run with --profile to also print the top functions of a cProfile run of each.
+
+Usage:
+    python Benchmark_Row_Ops.py [--profile]
+"""
+
+def legacy_reduce_row(A, r1, r2, column_index):
+    if A[r1][column_index] != 0:
+        A[r1] = multiply_row(A, r1, 1 / A[r1][column_index])
+        sub_r1 = multiply_row(A, r1, -A[r2][column_index])
+        A[r2] = add_two_rows(A, sub_r1, r2)
+
+    return A
+
+
+def legacy_rref(A):
+    """
+    The rref loop before the in-place kernel, returns (A, number of row operations)
+    """
+    zeros_to_bottom(A)
+    frontier = 0
+    col = 0
+    row_ops = 0
+
+    while frontier < len(A):
+        if A[frontier] != [0]*len(A[0]):
+            get_top_row(A, col, frontier)
+            for r in range(len(A)):
+                if r != frontier:
+                    legacy_reduce_row(A, r1=frontier, r2=r, column_index=col)
+                    row_ops += 1
+        frontier += 1
+        col += 1
+
+    return A, row_ops
+
+
+def random_matrix(m, n, kind, rng):
+    if kind == "fraction":
+        return [[Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(n)] for _ in range(m)]
+    if kind == "sparse":
+        return [[rng.uniform(-1, 1) if rng.random() < 0.1 else 0.0 for _ in range(n)] for _ in range(m)]
+    return [[rng.uniform(-1, 1) for _ in range(n)] for _ in range(m)]
+
+
+def time_it(function, A):
+    start = time.perf_counter()
+    function([row[:] for row in A])
+    return time.perf_counter() - start
+
+
+def main(profile=False):
+    rng = random.Random(0)
+    cases = [("float", 50), ("float", 100), ("float", 200), ("sparse", 200), ("fraction", 30), ("fraction", 60)]
+
+    print(f"{'kind':>8} {'size':>9} {'row ops':>8} {'before ns/op':>13} {'after ns/op':>12} {'speedup':>8}")
+    for kind, size in cases:
+        A = random_matrix(size, size + 1, kind, rng)
+
+        legacy_result, row_ops = legacy_rref([row[:] for row in A])
+        # Fractions must match exactly, floats up to round-off (the old loop re-normalized the pivot row per row op)
+        result = rref([row[:] for row in A])
+        assert all(abs(a - b) <= 1e-9 for row, legacy_row in zip(result, legacy_result) for a, b in zip(row, legacy_row))
+        assert kind != "fraction" or result == legacy_result
+
+        before = time_it(legacy_rref, A)
+        after = time_it(rref, A)
+        print(f"{kind:>8} {size:>4}x{size + 1:<4} {row_ops:>8} {before / row_ops * 1e9:>13,.0f} "
+              f"{after / row_ops * 1e9:>12,.0f} {before / after:>7.1f}x")
+
+    if profile:
+        A = random_matrix(100, 101, "float", rng)
+        for name, function in (("before", legacy_rref), ("after", rref)):
+            print("\n== cProfile:", name, "(100x101 float) ==")
+            profiler = cProfile.Profile()
+            profiler.runcall(function, [row[:] for row in A])
+            pstats.Stats(profiler).sort_stats("tottime").print_stats(8)
+
+
+if __name__ == "__main__":
+    main(profile="--profile" in sys.argv)
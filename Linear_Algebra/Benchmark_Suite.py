@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from fractions import Fraction
+from Guass_Jordan_Elimination import rref, reduce_row, get_top_row
+from Modular_Elimination import rref_modular
+from Sparse_Matrix import sparse_rref
+from LU_Factorization import LUFactorization
+from Null_Space import null_space
+
+try:
+    import numpy as np
+except ImportError:  # without numpy the "numpy" and "blocked" engines are skipped
+    np = None
+
+
+"""
+Linear Algebra Benchmark Suite
+
+Times every available engine on random matrices of several kinds and sizes, and records for each run
+    seconds:    best time of one call (the call is repeated until MIN_SECONDS have passed, at most --repeat times)
+    ops_per_sec: calls per second (1 / seconds)
+    peak_bytes: peak memory allocated during one call (tracemalloc, numpy allocations included)
+The results are written to JSON. Given a baseline JSON (an earlier run), every run that is slower or uses more
+memory than the baseline by more than --threshold is reported, and the exit status is 1 (for CI). Slowdowns below
+MIN_REGRESSION_SECONDS are ignored: on sub-millisecond runs a few percent of jitter is easily 25%.
+
+Matrix kinds (all n x n, a fixed seed per kind and size so runs are comparable):
+    dense           floats uniform in [-1, 1]
+    sparse          floats, SPARSE_DENSITY of the entries NON-ZERO plus a NON-ZERO diagonal (invertible)
+    rank_deficient  floats, rank n // 2
+    fraction        Fractions with small numerators and denominators
+
+Every engine has a size cap per kind, so the slow pure Python engines are not run on 2000 x 2000 matrices.
+
+Usage:
+    python Benchmark_Suite.py [--sizes 10 50 ...] [--engines ...] [--kinds ...] [--output results.json]
+                              [--baseline baseline.json] [--threshold 0.25]
+"""
+
+SIZES = [10, 50, 100, 200, 500, 1000, 2000]
+KINDS = ["dense", "sparse", "rank_deficient", "fraction"]
+SPARSE_DENSITY = 0.05
+MIN_SECONDS = 0.2
+MIN_REGRESSION_SECONDS = 0.005  # slowdowns smaller than this are timer / scheduler noise, not regressions
+
+
+def random_matrix(n, kind, seed):
+    rng = random.Random(seed)
+    if kind == "dense":
+        return [[rng.uniform(-1, 1) for _ in range(n)] for _ in range(n)]
+    if kind == "sparse":
+        A = [[rng.uniform(-1, 1) if rng.random() < SPARSE_DENSITY else 0.0 for _ in range(n)] for _ in range(n)]
+        for i in range(n):
+            A[i][i] = rng.uniform(1, 2)
+        return A
+    if kind == "rank_deficient":
+        r = max(n // 2, 1)
+        B = [[rng.uniform(-1, 1) for _ in range(r)] for _ in range(n)]
+        C = [[rng.uniform(-1, 1) for _ in range(n)] for _ in range(r)]
+        if np is not None:
+            return (np.array(B) @ np.array(C)).tolist()
+        return [[sum(b * c for b, c in zip(row, col)) for col in zip(*C)] for row in B]
+    if kind == "fraction":
+        return [[Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(n)] for _ in range(n)]
+    raise ValueError("unknown matrix kind " + kind)
+
+
+def _row_ops(A):
+    """
+    One pass of the row helpers: get_top_row on the first column, then reduce_row of every row by row 0
+    """
+    get_top_row(A, 0, 0)
+    for r in range(1, len(A)):
+        reduce_row(A, 0, r, 0)
+
+
+def _lu_solve(A):
+    LUFactorization(A).solve_many([[row[0]] for row in A])
+
+
+# name -> (function called with a fresh copy of the matrix, {kind: largest size}, needs numpy)
+ENGINES = {
+    "rref_list": (lambda A: rref(A), {"dense": 200, "sparse": 200, "rank_deficient": 200, "fraction": 50}, False),
+    "rref_numpy": (lambda A: rref(A, backend="numpy", as_list=False),
+                   {"dense": 1000, "sparse": 1000, "rank_deficient": 1000}, True),
+    "rref_blocked": (lambda A: rref(A, backend="blocked", as_list=False),
+                     {"dense": 2000, "sparse": 2000, "rank_deficient": 2000}, True),
+    "rref_exact": (lambda A: rref(A, exact=True), {"fraction": 50}, False),
+    "rref_modular": (rref_modular, {"fraction": 100}, False),
+    "sparse_rref": (sparse_rref, {"sparse": 500, "fraction": 50}, False),
+    "lu_solve": (_lu_solve, {"dense": 500, "sparse": 200, "fraction": 50}, False),
+    "null_space": (null_space, {"fraction": 50}, False),
+    "row_ops": (_row_ops, {"dense": 2000, "fraction": 200}, False),
+}
+
+
+def _copy(A):
+    return [row[:] for row in A]
+
+
+def time_engine(function, A, repeat):
+    best = float("inf")
+    total = 0.0
+    for _ in range(repeat):
+        B = _copy(A)
+        start = time.perf_counter()
+        function(B)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        if total >= MIN_SECONDS:
+            break
+
+    return best
+
+
+def peak_memory(function, A):
+    B = _copy(A)
+    tracemalloc.start()
+    try:
+        function(B)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, engines, kinds, repeat):
+    results = []
+    for kind in kinds:
+        for n in sizes:
+            A = None
+            for name in engines:
+                function, caps, needs_numpy = ENGINES[name]
+                if n > caps.get(kind, 0) or (needs_numpy and np is None):
+                    continue
+                A = A if A is not None else random_matrix(n, kind, seed=n)
+
+                seconds = time_engine(function, A, repeat)
+                result = {"engine": name, "kind": kind, "size": n, "seconds": seconds,
+                          "ops_per_sec": 1 / seconds if seconds else float("inf"),
+                          "peak_bytes": peak_memory(function, A)}
+                results.append(result)
+                print(f"{name:>14} {kind:>15} {n:>5} {seconds:>11.6f} s {result['ops_per_sec']:>12,.1f} ops/s "
+                      f"{result['peak_bytes'] / 2**20:>9.2f} MiB", flush=True)
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    :return: list of messages, one per run that is more than threshold (fraction) slower or bigger than baseline
+             (and, for the time, slower by at least MIN_REGRESSION_SECONDS)
+    """
+    previous = {(r["engine"], r["kind"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get((result["engine"], result["kind"], result["size"]))
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if metric == "seconds" and result[metric] - old[metric] < MIN_REGRESSION_SECONDS:
+                continue
+            if old[metric] and result[metric] > old[metric] * (1 + threshold):
+                regressions.append(f"{result['engine']} {result['kind']} {result['size']}: {metric} "
+                                   f"{old[metric]:.6g} -> {result[metric]:.6g} (+{result[metric] / old[metric] - 1:.0%})")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Linear Algebra engines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--kinds", nargs="+", default=KINDS, choices=KINDS)
+    parser.add_argument("--repeat", type=int, default=5, help="maximum number of timed calls per run")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown / memory growth against the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.engines, args.kinds, args.repeat)
+    report = {"meta": {"python": sys.version.split()[0], "numpy": np.__version__ if np is not None else None,
+                       "platform": platform.platform(), "cpus": os.cpu_count(), "time": time.time()},
+              "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+    print("results written to", args.output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for message in regressions:
+            print("REGRESSION", message)
+        if regressions:
+            return 1
+        print("no regressions against", args.baseline)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
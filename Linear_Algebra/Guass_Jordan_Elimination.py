@@ -1,7 +1,14 @@
 from multipledispatch import dispatch
+from concurrent.futures import ThreadPoolExecutor
 import math
+import os
 from fractions import Fraction
 
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the "numpy" and "blocked" backends of rref
+    np = None
+
 
 """
 Gauss-Jordan Elimination Method
@@ -21,12 +28,23 @@ Rules of Reduced Row Echelon Form:
     4. A row containing of all 0s MUST BE the LAST ROW (or beneath a row containing at least one non-zero entry)
 """
 
-def rref(A):
+def rref(A, backend="list", tol=None, return_pivots=False, as_list=True, exact=False, workers=None, block_size=64):
     """
     Converts an Augmented Matrix (where last column represents systems' values) into Reduced Row Echelon Form
 
     :param A: 2D array representing an Augmented Matrix (m x n)
-    :return: 2D array Matrix A in Reduced Row Echelon Form
+    :param backend: "list" runs the row operations below on A itself (in place),
+                    "numpy" converts A to a float array and eliminates whole columns at once (A is not modified),
+                    "blocked" is the "numpy" backend in panels of columns with a threaded update, see rref_blocked
+    :param tol: "numpy" and "blocked" backends only, entries with absolute value <= tol are treated as 0
+                (defaults to max(m, n) * machine epsilon * largest absolute row sum of A)
+    :param return_pivots: if True, also return the list of pivot column indices
+    :param as_list: "numpy" and "blocked" backends only, return a 2D list (like the "list" backend) instead of an ndarray
+    :param exact: if True, ignore backend and use fraction-free (Bareiss) elimination over Python ints,
+                  see rref_exact (A is not modified and the result holds Fractions)
+    :param workers: "blocked" backend only, number of threads (defaults to the number of CPUs)
+    :param block_size: "blocked" backend only, number of columns per panel / tile
+    :return: 2D array Matrix A in Reduced Row Echelon Form (and the pivot columns if return_pivots)
 
     Algorithm:
     - Begin at Row, R = 0; Column, C = 0; Frontier = 0
@@ -39,23 +57,342 @@ def rref(A):
         6. Ensure the leading entry of a row is to the right of the leading entry of the previous row
     """
 
+    assert backend in ("list", "numpy", "blocked"), "backend must be 'list', 'numpy' or 'blocked'"
+
+    if exact:
+        R, pivots = rref_exact(A)
+        return (R, pivots) if return_pivots else R
+
+    if backend in ("numpy", "blocked"):
+        if backend == "numpy":
+            R, pivots = rref_numpy(A, tol)
+        else:
+            R, pivots = rref_blocked(A, tol, workers, block_size)
+        if as_list:
+            R = R.tolist()
+        return (R, pivots) if return_pivots else R
+
+    eliminate_in_place(A)
+
+    if return_pivots:
+        return A, pivot_columns(A)
+    return A
+
+
+def eliminate_in_place(A):
+    """
+    The row operation kernel of the "list" backend of rref (steps 1 - 5 above).
+    Rows are updated in place through slice assignment, rows whose multiplier is 0 are skipped, and the
+    helpers below (which go through multipledispatch and build new rows) are not called on this hot path.
+
+    :param A: 2D array representing an Augmented Matrix (m x n), modified in place
+    :return: A
+    """
+
     zeros_to_bottom(A)
-    
+
+    n = len(A[0])
     frontier = 0
     col = 0
 
-    while frontier < len(A):
-        if A[frontier] != [0]*len(A[0]):
-            get_top_row(A, col, frontier)
-            for r in range(len(A)):
-                if r != frontier:
-                    reduce_row(A, r1=frontier, r2=r, column_index=col)
+    while frontier < len(A) and col < n:
+        if any(A[frontier]):
+            swap(A, frontier, _top_row_index(A, col, frontier))
+            top = A[frontier]
+            pivot = top[col]
+            if pivot != 0:
+                _scale_row(top, 1 / pivot)
+                for r, row in enumerate(A):
+                    factor = row[col]
+                    if r != frontier and factor != 0:
+                        _subtract_scaled_row(row, top, factor)
         frontier += 1
         col += 1
-        
+
     return A
 
 
+def _scale_row(row, s):
+    row[:] = [val * s for val in row]
+
+
+def _subtract_scaled_row(row, top, factor):
+    row[:] = [val - factor * top_val for val, top_val in zip(row, top)]
+
+
+def rref_numpy(A, tol=None):
+    """
+    Gauss-Jordan Elimination with partial pivoting on a float numpy array.
+    For every column, the row with the largest absolute value (at or below the frontier) becomes the pivot row
+    and the column is cleared in all other rows with a single rank-1 update, instead of one row at a time.
+    Columns whose candidates are all within tol of 0 have no pivot and are skipped.
+
+    :param A: 2D array or ndarray representing a Matrix (m x n)
+    :param tol: entries with absolute value <= tol count as 0, see rref
+    :return: (R, pivots) where R is the float ndarray in RREF and pivots the list of pivot column indices
+    """
+
+    assert np is not None, "the numpy backend requires numpy"
+
+    R = np.array(A, dtype=float)
+    m, n = R.shape
+    if tol is None:
+        # round-off of the eliminated entries grows with the largest absolute row sum of A
+        tol = max(m, n) * np.finfo(float).eps * (np.abs(R).sum(axis=1).max() if R.size else 0)
+
+    pivots, _ = _eliminate_columns(R, 0, tol)
+    return R, pivots
+
+
+def _eliminate_columns(R, frontier, tol, swaps=None):
+    """
+    The column loop of rref_numpy: eliminates every column of the float ndarray R (in place), starting with
+    pivot row frontier. The rows above frontier are cleared as well (they already hold earlier pivots).
+
+    :param swaps: if given, every row swap (row1, row2) is appended to it
+    :return: (pivots, frontier) with the pivot column indices of R and the row after the last pivot row
+    """
+
+    m, n = R.shape
+    pivots = []
+    for col in range(n):
+        if frontier == m:
+            break
+
+        pivot_row = frontier + int(np.argmax(np.abs(R[frontier:, col])))
+        if abs(R[pivot_row, col]) <= tol:
+            R[frontier:, col] = 0  # only round-off is left in this column
+            continue
+
+        if pivot_row != frontier:
+            R[[frontier, pivot_row]] = R[[pivot_row, frontier]]
+            if swaps is not None:
+                swaps.append((frontier, pivot_row))
+        R[frontier, col:] /= R[frontier, col]
+
+        # rank-1 update: subtract (column value) x (pivot row) from every other row
+        factors = R[:, col].copy()
+        factors[frontier] = 0
+        R[:, col:] -= np.outer(factors, R[frontier, col:])
+        R[:, col] = 0
+        R[frontier, col] = 1
+
+        pivots.append(col)
+        frontier += 1
+
+    return pivots, frontier
+
+
+def rref_blocked(A, tol=None, workers=None, block_size=64):
+    """
+    Blocked Gauss-Jordan Elimination: the same result as rref_numpy (same pivots and pivot rows), computed one
+    panel of block_size columns at a time so most of the work is matrix products that run on a thread pool.
+        1. Panel factorization: eliminate the panel columns with rref_numpy's column loop (on a copy of the panel,
+           all m rows but only block_size columns) and record the row swaps and the pivots
+        2. Trailing update: the panel's row operations, applied to the columns right of the panel, are
+               pivot rows:  U = solve(A0[pivot rows][:, pivot cols], T[pivot rows])
+               other rows:  T[others] -= A0[others][:, pivot cols] @ U
+           where A0 is the panel before step 1 (after the swaps) and T the trailing columns.
+           The trailing columns are split into tiles of block_size columns, which are independent and are
+           updated in place on the shared ndarray by the threads (numpy releases the GIL inside the products).
+
+    :param A: 2D array or ndarray representing a Matrix (m x n)
+    :param tol: entries with absolute value <= tol count as 0, see rref
+    :param workers: number of threads for the trailing update (defaults to the number of CPUs)
+    :param block_size: number of columns per panel and per tile
+    :return: (R, pivots) where R is the float ndarray in RREF and pivots the list of pivot column indices
+    """
+
+    assert np is not None, "the blocked backend requires numpy"
+    assert block_size > 0, "block_size must be positive"
+
+    R = np.array(A, dtype=float)
+    m, n = R.shape
+    if tol is None:
+        tol = max(m, n) * np.finfo(float).eps * (np.abs(R).sum(axis=1).max() if R.size else 0)
+    workers = workers or os.cpu_count() or 1
+
+    def update_tile(j0, j1, pivot_rows, A0_pivot, A0_pivot_cols):
+        T = R[:, j0:j1]
+        U = np.linalg.solve(A0_pivot, T[pivot_rows])
+        T -= A0_pivot_cols @ U  # the pivot rows become 0 here ...
+        T[pivot_rows] = U  # ... and are replaced by U
+
+    pivots = []
+    frontier = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for c0 in range(0, n, block_size):
+            if frontier == m:
+                break
+            c1 = min(c0 + block_size, n)
+
+            panel = R[:, c0:c1].copy()
+            swaps = []
+            panel_pivots, new_frontier = _eliminate_columns(panel, frontier, tol, swaps)
+
+            for row1, row2 in swaps:
+                R[[row1, row2], c0:] = R[[row2, row1], c0:]
+            A0 = R[:, c0:c1]  # the panel before elimination, rows in the order of the swaps
+            R_pivot_cols = [c0 + col for col in panel_pivots]
+
+            if panel_pivots and c1 < n:
+                pivot_rows = slice(frontier, new_frontier)
+                A0_pivot_cols = np.ascontiguousarray(A0[:, panel_pivots])
+                A0_pivot = A0_pivot_cols[pivot_rows]
+                tiles = [(j0, min(j0 + block_size, n)) for j0 in range(c1, n, block_size)]
+                if workers == 1:
+                    for j0, j1 in tiles:
+                        update_tile(j0, j1, pivot_rows, A0_pivot, A0_pivot_cols)
+                else:
+                    for future in [executor.submit(update_tile, j0, j1, pivot_rows, A0_pivot, A0_pivot_cols)
+                                   for j0, j1 in tiles]:
+                        future.result()
+
+            R[:, c0:c1] = panel
+            pivots += R_pivot_cols
+            frontier = new_frontier
+
+    return R, pivots
+
+
+def integer_rows(A):
+    """
+    Scales every row of A by the lcm of its denominators so all entries become integers.
+    Scaling a row by a non-zero value does not change the RREF (basic operation 2).
+
+    :param A: 2D array of ints, Fractions (or floats, which are converted exactly)
+    :return: (M, scales) where M is the integer Matrix and scales[r] the factor row r was multiplied by
+    """
+
+    M = []
+    scales = []
+    for row in A:
+        row = [Fraction(val) for val in row]
+        scale = math.lcm(*(val.denominator for val in row)) if row else 1
+        M.append([int(val * scale) for val in row])
+        scales.append(scale)
+
+    return M, scales
+
+
+def bareiss(M, jordan=True):
+    """
+    Fraction-free (Bareiss) elimination of an integer Matrix, in place.
+    Row r2 is updated as (pivot * r2 - r2[col] * pivot_row) / previous pivot. The division is always exact,
+    so every entry stays an integer (a minor of the input) and no gcd is ever computed.
+
+    :param M: 2D array of integers (m x n), modified in place
+    :param jordan: if True, clear the pivot columns above the pivots too (Gauss-Jordan); afterwards the
+                   pivot entries all equal the last pivot. If False, only the rows below (row echelon form).
+    :return: (pivots, sign) the list of pivot column indices and (-1)**(number of row swaps)
+    """
+
+    m = len(M)
+    n = len(M[0]) if M else 0
+    previous_pivot = 1
+    pivots = []
+    sign = 1
+    frontier = 0
+
+    for col in range(n):
+        if frontier == m:
+            break
+
+        pivot_row = next((r for r in range(frontier, m) if M[r][col] != 0), None)
+        if pivot_row is None:
+            continue
+        if pivot_row != frontier:
+            swap(M, frontier, pivot_row)
+            sign = -sign
+
+        top = M[frontier]
+        pivot = top[col]
+        for r in range(0 if jordan else frontier + 1, m):
+            if r != frontier:
+                factor = M[r][col]
+                M[r] = [(pivot * val - factor * top_val) // previous_pivot for val, top_val in zip(M[r], top)]
+
+        previous_pivot = pivot
+        pivots.append(col)
+        frontier += 1
+
+    return pivots, sign
+
+
+def rref_exact(A):
+    """
+    Exact RREF: the rows are scaled to integers, reduced with fraction-free Gauss-Jordan elimination
+    (bareiss) and only divided by their pivots at the very end.
+
+    :param A: 2D array of ints or Fractions (m x n), not modified
+    :return: (R, pivots) where R is the 2D array of Fractions in RREF and pivots the pivot column indices
+    """
+
+    M, _ = integer_rows(A)
+    pivots, _ = bareiss(M, jordan=True)
+
+    R = []
+    for r, row in enumerate(M):
+        if r < len(pivots):
+            R.append([Fraction(val, row[pivots[r]]) for val in row])
+        else:
+            R.append([Fraction(0)] * len(row))
+
+    return R, pivots
+
+
+def det(A):
+    """
+    Exact determinant of a square Matrix using fraction-free elimination
+
+    :param A: 2D array of ints or Fractions (n x n)
+    :return: int (if A has only integers) or Fraction
+    """
+
+    assert len(A) == len(A[0]), "Matrix must be square!"
+
+    M, scales = integer_rows(A)
+    pivots, sign = bareiss(M, jordan=False)
+    if len(pivots) < len(M):
+        return 0
+
+    # the last Bareiss pivot is the determinant of the scaled Matrix
+    result = Fraction(sign * M[-1][-1], math.prod(scales))
+    return int(result) if result.denominator == 1 else result
+
+
+def rank(A):
+    """
+    Exact rank of a Matrix (number of pivots) using fraction-free elimination
+
+    :param A: 2D array of ints or Fractions (m x n)
+    :return: integer rank
+    """
+
+    M, _ = integer_rows(A)
+    pivots, _ = bareiss(M, jordan=False)
+
+    return len(pivots)
+
+
+def pivot_columns(A):
+    """
+    Returns the column index of the leading NON-ZERO entry of every non-zero row of a Matrix in RREF
+
+    :param A: 2D array representing a Matrix in RREF (m x n)
+    :return: list of pivot column indices
+    """
+
+    pivots = []
+    for row in A:
+        for col_ix, col_val in enumerate(row):
+            if col_val != 0:
+                pivots.append(col_ix)
+                break
+
+    return pivots
+
+
 def zeros_to_bottom(A):
     """
     Ensures all zero rows are at the bottom of the Augmented Matrix A
@@ -96,16 +433,20 @@ def get_top_row(A, column_index, frontier_row=0):
     :return: A
     """
 
+    swap(A, r1=frontier_row, r2=_top_row_index(A, column_index, frontier_row))
+
+    return A
+
+
+def _top_row_index(A, column_index, frontier_row):
     max_column_value = max_row_id = -math.inf
 
-    for row_idx, row in enumerate(A):
-        if row_idx >= frontier_row:
-            if abs(row[column_index]) > max_column_value:
-                max_column_value = row[column_index]
-                max_row_id = row_idx
-    swap(A, r1=frontier_row, r2=max_row_id)
+    for row_idx in range(frontier_row, len(A)):
+        if abs(A[row_idx][column_index]) > max_column_value:
+            max_column_value = A[row_idx][column_index]
+            max_row_id = row_idx
 
-    return A
+    return max_row_id
 
 
 @dispatch(list, int)
@@ -209,11 +550,10 @@ def reduce_row(A, r1, r2, column_index):
     """
     # first, we simply r1 by multiplying it by 1 / r1[column_index]
     if A[r1][column_index] != 0:
-        A[r1] = multiply_row(A, r1, 1 / A[r1][column_index])
-        # now that r1 is scaled properly, we multiply it with -r2[column_index]
-        sub_r1 = multiply_row(A, r1, -A[r2][column_index])
-        # finally, we add the negatively weighted r1 with r2
-        A[r2] = add_two_rows(A, sub_r1, r2)
+        _scale_row(A[r1], 1 / A[r1][column_index])
+        # now that r1 is scaled properly, we subtract r2[column_index] times r1 from r2
+        if A[r2][column_index] != 0:
+            _subtract_scaled_row(A[r2], A[r1], A[r2][column_index])
 
     return A
 
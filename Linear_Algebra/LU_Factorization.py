@@ -0,0 +1,169 @@
+from fractions import Fraction
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # without numpy solve_many substitutes on Python lists
+    np = None
+
+
+"""
+LU Factorization
+
+Primary Use: Solve A x = b for many right-hand sides b with the same (square) Matrix A
+
+Gauss-Jordan Elimination of the Augmented Matrix [A | b] repeats every row operation on A for each new b.
+The row operations only depend on A, so they can be recorded once:
+    1. SWAP rows: the row permutation P (partial pivoting, the largest absolute value of the column on top)
+    2. Add a scalar multiple of the pivot row to a row below it: the multiplier, stored below the diagonal (L)
+What is left of A after the forward elimination is the upper triangular U, with P A = L U.
+
+A new right-hand side b then only needs O(n^2) work:
+    1. Forward substitution L y = P b (replays the recorded row operations on b)
+    2. Back substitution U x = y
+solve_many does both for a whole Matrix of right-hand sides at once, one row operation per row of B.
+
+Ints and Fractions are factorized exactly (as Fractions), floats up to a tolerance.
+"""
+
+class LUFactorization:
+    def __init__(self, A, tol=None):
+        """
+        :param A: 2D array, square Matrix (n x n), not modified
+        :param tol: floats only, a pivot with absolute value <= tol means A is singular
+                    (defaults to n * machine epsilon * largest absolute row sum of A)
+        """
+
+        n = len(A)
+        assert n > 0 and all(len(row) == n for row in A), "LU Factorization needs a square Matrix!"
+
+        self.n = n
+        self.exact = all(isinstance(val, (int, Fraction)) for row in A for val in row)
+        if self.exact:
+            LU = [[Fraction(val) for val in row] for row in A]
+            tol = 0
+        else:
+            LU = [[float(val) for val in row] for row in A]
+            if tol is None:
+                tol = n * sys.float_info.epsilon * max(sum(abs(val) for val in row) for row in LU)
+
+        self.permutation = list(range(n))  # row i of P A is row permutation[i] of A
+        self.swaps = 0
+
+        for col in range(n):
+            pivot_row = max(range(col, n), key=lambda r: abs(LU[r][col]))
+            if abs(LU[pivot_row][col]) <= tol:
+                raise ValueError("Matrix is singular!")
+            if pivot_row != col:
+                LU[col], LU[pivot_row] = LU[pivot_row], LU[col]
+                self.permutation[col], self.permutation[pivot_row] = self.permutation[pivot_row], self.permutation[col]
+                self.swaps += 1
+
+            top = LU[col]
+            pivot = top[col]
+            for row in LU[col + 1:]:
+                factor = row[col] / pivot
+                row[col] = factor  # the multiplier takes the place of the entry it eliminated
+                if factor != 0:
+                    row[col + 1:] = [val - factor * top_val for val, top_val in zip(row[col + 1:], top[col + 1:])]
+
+        self.LU = LU
+        self._LU_array = None
+
+
+    def L(self):
+        """
+        Unit lower triangular Matrix of the multipliers
+        """
+        one, zero = (Fraction(1), Fraction(0)) if self.exact else (1.0, 0.0)
+        return [row[:i] + [one] + [zero] * (self.n - i - 1) for i, row in enumerate(self.LU)]
+
+
+    def U(self):
+        """
+        Upper triangular Matrix left after the forward elimination
+        """
+        zero = Fraction(0) if self.exact else 0.0
+        return [[zero] * i + row[i:] for i, row in enumerate(self.LU)]
+
+
+    def det(self):
+        """
+        Determinant of A: product of the pivots, negated for an odd number of row swaps
+        """
+        result = -1 if self.swaps % 2 else 1
+        for i, row in enumerate(self.LU):
+            result *= row[i]
+        return result
+
+
+    def solve(self, b):
+        """
+        Solves A x = b
+
+        :param b: list of n values
+        :return: list x of n values (Fractions if the factorization is exact)
+        """
+
+        assert len(b) == self.n, "b must have one value per row of A!"
+
+        # forward substitution: L y = P b
+        y = [Fraction(b[i]) if self.exact else b[i] for i in self.permutation]
+        for i, row in enumerate(self.LU):
+            y[i] -= sum(row[j] * y[j] for j in range(i))
+
+        # back substitution: U x = y
+        x = y
+        for i in range(self.n - 1, -1, -1):
+            row = self.LU[i]
+            x[i] = (x[i] - sum(row[j] * x[j] for j in range(i + 1, self.n))) / row[i]
+
+        return x
+
+
+    def solve_many(self, B):
+        """
+        Solves A X = B for all columns of B at once
+
+        :param B: 2D array (n x r), every column is a right-hand side
+        :return: 2D array X (n x r), column j of X solves A x = column j of B
+                 (a 2D list, Fractions if the factorization is exact)
+        """
+
+        assert len(B) == self.n, "B must have one row per row of A!"
+
+        if np is not None and not self.exact:
+            if self._LU_array is None:
+                self._LU_array = np.array(self.LU)
+            LU = self._LU_array
+            X = np.array(B, dtype=float)[self.permutation]
+            for i in range(1, self.n):
+                X[i] -= LU[i, :i] @ X[:i]
+            for i in range(self.n - 1, -1, -1):
+                X[i] = (X[i] - LU[i, i + 1:] @ X[i + 1:]) / LU[i, i]
+            return X.tolist()
+
+        # the same row operations as in __init__, applied to whole rows of B
+        X = [[Fraction(val) for val in B[i]] if self.exact else list(B[i]) for i in self.permutation]
+        for i, row in enumerate(self.LU):
+            for j in range(i):
+                factor = row[j]
+                if factor != 0:
+                    X[i] = [val - factor * top_val for val, top_val in zip(X[i], X[j])]
+        for i in range(self.n - 1, -1, -1):
+            row = self.LU[i]
+            for j in range(i + 1, self.n):
+                factor = row[j]
+                if factor != 0:
+                    X[i] = [val - factor * top_val for val, top_val in zip(X[i], X[j])]
+            X[i] = [val / row[i] for val in X[i]]
+
+        return X
+
+
+if __name__ == "__main__":
+    A = [[2, 1, 1], [4, -6, 0], [-2, 7, 2]]
+    lu = LUFactorization(A)
+    print("det(A) =", lu.det())
+    print("x =", lu.solve([5, -2, 9]))
+    print("X =", lu.solve_many([[5, 1], [-2, 0], [9, 0]]))
@@ -0,0 +1,264 @@
+from Guass_Jordan_Elimination import integer_rows
+from fractions import Fraction
+import math
+
+try:
+    import numpy as np
+except ImportError:  # without numpy the elimination mod p runs on Python lists
+    np = None
+
+
+"""
+Multi-Modular Exact Elimination
+
+Primary Use: exact RREF, rank and Null Space of large integer / Fraction matrices
+
+Even fraction-free elimination works with integers that grow with the size of the Matrix.
+Instead, the (integer scaled) Matrix is reduced modulo several word-size primes p, where every entry stays
+below p and the row operations can run on int64 numpy arrays.
+The results are then lifted back to the rationals:
+    1. Chinese Remainder Theorem: combine the residues of every entry modulo p1, p2, ... into a residue
+       modulo P = p1 * p2 * ...
+    2. Rational Reconstruction: find the fraction a / b with small |a| and b that is congruent to that residue
+    3. Verification: the candidate is only returned once every row of A is the combination of the candidate
+       rows given by its own pivot columns, which proves it is the RREF of A
+
+A prime dividing some pivot minor ("unlucky" prime) gives a smaller rank or later pivot columns than
+the true RREF. Such primes are detected by comparing pivot columns and discarded.
+"""
+
+# primes are chosen below this bound: the product of two residues is below 2**48, so an int64 entry can
+# absorb LAZY_REDUCTION_STEPS row updates before it has to be reduced modulo p again
+PRIME_BOUND = 2**24
+LAZY_REDUCTION_STEPS = 2**14
+
+
+def _is_prime(n):
+    """
+    Deterministic Miller-Rabin test for n < 3 * 10**9 (bases 2, 3, 5, 7), enough for every n < PRIME_BOUND
+    """
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7):
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 3, 5, 7):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def word_primes():
+    """
+    Yields primes below PRIME_BOUND, largest first
+    """
+    candidate = PRIME_BOUND - 1
+    while candidate > 2:
+        if _is_prime(candidate):
+            yield candidate
+        candidate -= 2
+
+
+def rref_mod_p(M, p):
+    """
+    Gauss-Jordan Elimination over the integers modulo a prime p
+
+    :param M: 2D array of integers (m x n), not modified
+    :param p: prime below PRIME_BOUND
+    :return: (R, pivots) where R is the 2D list of residues in RREF modulo p and pivots the pivot column indices
+    """
+
+    m = len(M)
+    n = len(M[0]) if M else 0
+    pivots = []
+    frontier = 0
+
+    if np is not None:
+        # entries are only reduced modulo p where they are read (pivot column, pivot row), the rest of the
+        # Matrix accumulates the updates and is reduced every LAZY_REDUCTION_STEPS pivots and at the end
+        R = np.array([[val % p for val in row] for row in M], dtype=np.int64).reshape(m, n)
+        for col in range(n):
+            if frontier == m:
+                break
+            factors = R[:, col] % p
+            non_zero = np.flatnonzero(factors[frontier:])
+            if len(non_zero) == 0:
+                continue
+            pivot_row = frontier + int(non_zero[0])
+            if pivot_row != frontier:
+                R[[frontier, pivot_row]] = R[[pivot_row, frontier]]
+                factors[[frontier, pivot_row]] = factors[[pivot_row, frontier]]
+
+            # columns left of col are already reduced (0 in the pivot row), so only the trailing columns change
+            top = R[frontier, col:] % p
+            top = top * pow(int(top[0]), -1, p) % p
+
+            factors[frontier] = 0
+            R[:, col:] -= np.outer(factors, top)
+            R[frontier, col:] = top
+
+            pivots.append(col)
+            frontier += 1
+            if frontier % LAZY_REDUCTION_STEPS == 0:
+                R %= p
+
+        R %= p
+        return R.tolist(), pivots
+
+    R = [[val % p for val in row] for row in M]
+    for col in range(n):
+        if frontier == m:
+            break
+        pivot_row = next((r for r in range(frontier, m) if R[r][col]), None)
+        if pivot_row is None:
+            continue
+        R[frontier], R[pivot_row] = R[pivot_row], R[frontier]
+        inverse = pow(R[frontier][col], -1, p)
+        top = R[frontier] = [val * inverse % p for val in R[frontier]]
+        for r in range(m):
+            factor = R[r][col]
+            if r != frontier and factor:
+                R[r] = [(val - factor * top_val) % p for val, top_val in zip(R[r], top)]
+
+        pivots.append(col)
+        frontier += 1
+
+    return R, pivots
+
+
+def rational_reconstruction(a, modulus):
+    """
+    Finds the fraction x / y with |x|, y <= sqrt(modulus / 2) and x = a * y (mod modulus)
+
+    :return: Fraction, or None if no such fraction exists
+    """
+    bound = math.isqrt(modulus // 2)
+    r0, r1 = modulus, a % modulus
+    t0, t1 = 0, 1
+    while r1 > bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        t0, t1 = t1, t0 - q * t1
+
+    if t1 == 0 or abs(t1) > bound or math.gcd(r1, abs(t1)) != 1:
+        return None
+
+    return Fraction(r1, t1)
+
+
+def _verify(M, R, pivots):
+    """
+    Checks that every row of the integer Matrix M equals SUM(M[i][pivots[k]] * R[k]).
+    Together with rank(M) >= len(pivots) (true for the rank modulo any prime) this proves R = RREF(M).
+    """
+    denominator = math.lcm(*(val.denominator for row in R for val in row)) if R else 1
+    R_int = [[int(val * denominator) for val in row] for row in R]
+
+    for row in M:
+        combination = [0] * len(row)
+        for k, col in enumerate(pivots):
+            factor = row[col]
+            if factor:
+                combination = [c + factor * val for c, val in zip(combination, R_int[k])]
+        if any(c != val * denominator for c, val in zip(combination, row)):
+            return False
+
+    return True
+
+
+def rref_modular(A, return_pivots=False):
+    """
+    Exact RREF of a Matrix using multi-modular elimination with rational reconstruction
+
+    :param A: 2D array of ints or Fractions (m x n), not modified
+    :param return_pivots: if True, also return the list of pivot column indices
+    :return: 2D array of Fractions in RREF (same as rref(A, exact=True)), and the pivots if return_pivots
+    """
+
+    M, _ = integer_rows(A)
+    m = len(M)
+    n = len(M[0]) if M else 0
+
+    pivots = None
+    residues = None  # CRT combination of the pivot rows of every prime agreeing with pivots
+    modulus = 1
+    probe = None  # reconstruction of one entry, full reconstruction is only tried once it stops changing
+
+    for p in word_primes():
+        R_p, pivots_p = rref_mod_p(M, p)
+
+        # more pivots, or the same number further to the left, means all previous primes were unlucky
+        if pivots is None or (len(pivots_p), [-c for c in pivots_p]) > (len(pivots), [-c for c in pivots]):
+            pivots = pivots_p
+            residues = [row[:] for row in R_p[:len(pivots)]]
+            modulus = p
+            probe = None
+        elif pivots_p != pivots:
+            continue
+        else:
+            # x = residue (mod modulus) and x = r (mod p)  =>  x = residue + modulus * ((r - residue) / modulus mod p)
+            inverse = pow(modulus, -1, p)
+            residues = [[x + modulus * ((r - x) * inverse % p) for x, r in zip(row, row_p)]
+                        for row, row_p in zip(residues, R_p)]
+            modulus *= p
+
+        # the last entry of the last pivot row is usually one of the largest fractions of the RREF
+        previous_probe = probe
+        probe = rational_reconstruction(residues[-1][-1], modulus) if residues else None
+        if residues and (probe is None or probe != previous_probe):
+            continue
+
+        R = []
+        for row in residues:
+            reconstructed = [rational_reconstruction(x, modulus) for x in row]
+            if None in reconstructed:
+                break
+            R.append(reconstructed)
+        else:
+            if _verify(M, R, pivots):
+                R += [[Fraction(0)] * n for _ in range(m - len(pivots))]
+                return (R, pivots) if return_pivots else R
+
+
+def rank_modular(A):
+    """
+    Exact rank of a Matrix (number of pivots of rref_modular)
+    """
+    return len(rref_modular(A, return_pivots=True)[1])
+
+
+def null_space_modular(A):
+    """
+    Basis of the Null Space of A from the pivot structure of rref_modular
+
+    :param A: 2D array of ints or Fractions (m x n)
+    :return: list of vectors (lists of Fractions) x with A x = 0, one per non-pivot column
+    """
+
+    R, pivots = rref_modular(A, return_pivots=True)
+    n = len(A[0])
+
+    basis = []
+    for free_col in range(n):
+        if free_col in pivots:
+            continue
+        vector = [Fraction(0)] * n
+        vector[free_col] = Fraction(1)
+        for k, col in enumerate(pivots):
+            vector[col] = -R[k][free_col]
+        basis.append(vector)
+
+    return basis
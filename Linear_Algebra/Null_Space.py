@@ -1,5 +1,5 @@
 """
-Null Space: 
+Null Space:
     Of a matrix, A, defines the set of vectors, N, that satisfy the condition:
         A (x) Ni = The ZERO vector for 'i' in N
 
@@ -9,40 +9,42 @@ Implications of Null Space:
 
 High-Level Algorithm:
     The Null Space of A is equivalent to the Null Space of RREF(A)
-    Determine pivot rows of RREF(A),
+    Determine pivot columns of RREF(A),
         If all columns are pivot, then we reach L.I.
-        Otherwise, find the non-pivot columns
+        Otherwise, every non-pivot (free) column f gives one basis vector x of the Null Space:
+            x[f] = 1, x[pivot column of row k] = -RREF(A)[k][f], all other entries 0
 """
 
 from Guass_Jordan_Elimination import rref, print_result
-from fractions import Fraction 
+from fractions import Fraction
 
 
-def null_space(A, verbose=True):
+def null_space(A, verbose=False):
     """
     Finds the Null Space of Matrix A
-    
-    :param A: 2D array representing a Matrix (m x n)
-    :return: Set of vectors representing the Null Space
+
+    :param A: 2D array representing a Matrix (m x n), not modified
+    :param verbose: if True, print RREF(A) and the pivot / non-pivot columns
+    :return: List of vectors (lists of Fractions) that form a basis of the Null Space (empty if the columns of A are L.I.)
     """
-    
-    rref_a = rref(A)
-    print_result(rref_a)
-    
-    pivot_cols = []
-    non_pivot_cols = []
 
-    for col in range(len(A[0])):
-        col_row = get_column(A, col)
+    rref_a, pivot_cols = rref(A, exact=True, return_pivots=True)
+    non_pivot_cols = [col for col in range(len(A[0])) if col not in pivot_cols]
 
-        # if the number of 0's in that column is less than the number of rows - 1
-        if col_row.count(0) == len(A) - 1:  
-            pivot_cols.append(col)  # then it's a pivot column 
-        else: 
-            non_pivot_cols.append(col)  # otherwise, it's a non-pivot column
+    if verbose:
+        print_result(rref_a)
+        print(pivot_cols)
+        print(non_pivot_cols)
 
-    print(pivot_cols)
-    print(non_pivot_cols)
+    basis = []
+    for free_col in non_pivot_cols:
+        vector = [Fraction(0)] * len(A[0])
+        vector[free_col] = Fraction(1)
+        for k, col in enumerate(pivot_cols):
+            vector[col] = -rref_a[k][free_col]
+        basis.append(vector)
+
+    return basis
 
 
 def get_column(A, c):
@@ -56,7 +58,94 @@ def get_column(A, c):
     return [row[c] for row in A]
 
 
-A = [[Fraction(1, 1), Fraction(1, 1), Fraction(1, 1), Fraction(1, 1)], [Fraction(2, 1), Fraction(1, 1), Fraction(4, 1), Fraction(3, 1)],
-        [Fraction(3, 1), Fraction(4, 1), Fraction(1, 1), Fraction(2, 1)]]
-null_space(A)
+class IndependenceTracker:
+    """
+    Keeps a basis of the vectors added so far in Reduced Row Echelon Form (one row per basis vector),
+    so testing whether a new vector is Linearly Independent of them is one reduction, O(rank * n),
+    instead of running rref again on the growing Matrix.
+    """
+
+    def __init__(self, n, tol=None):
+        """
+        :param n: length of the vectors
+        :param tol: floats only, entries with absolute value <= tol are treated as 0 (defaults to 1e-12);
+                    ints and Fractions are reduced exactly
+        """
+        self.n = n
+        self.tol = 1e-12 if tol is None else tol
+        self.rows = []  # basis in RREF
+        self.pivot_cols = []  # pivot column of each row
+
+
+    def _reduce(self, v):
+        assert len(v) == self.n, "Vector must have length " + str(self.n)
+
+        exact = all(isinstance(val, (int, Fraction)) for val in v)
+        v = [Fraction(val) for val in v] if exact else [float(val) for val in v]
+        for row, col in zip(self.rows, self.pivot_cols):
+            factor = v[col]
+            if factor != 0:
+                v = [val - factor * row_val for val, row_val in zip(v, row)]
+
+        tol = 0 if exact else self.tol
+        return [0 if abs(val) <= tol else val for val in v]
+
+
+    def is_independent(self, v):
+        """
+        Returns True if v is NOT a linear combination of the vectors added so far (the basis is not changed)
+        """
+        return any(self._reduce(v))
+
+
+    def add(self, v):
+        """
+        Adds v to the basis if it is Linearly Independent of the vectors added so far
+
+        :param v: list of n values
+        :return: True if v was independent (and the rank grew by 1), False otherwise
+        """
+
+        v = self._reduce(v)
+        col = next((c for c, val in enumerate(v) if val != 0), None)
+        if col is None:
+            return False
+
+        pivot = v[col]
+        v = [val / pivot for val in v]
+
+        # keep the basis reduced: clear the new pivot column from the other rows
+        for r, row in enumerate(self.rows):
+            factor = row[col]
+            if factor != 0:
+                self.rows[r] = [val - factor * v_val for val, v_val in zip(row, v)]
+
+        # insert so the pivot columns stay sorted (Rule 3 of RREF)
+        k = next((k for k, c in enumerate(self.pivot_cols) if c > col), len(self.pivot_cols))
+        self.rows.insert(k, v)
+        self.pivot_cols.insert(k, col)
+        return True
+
+
+    @property
+    def rank(self):
+        return len(self.rows)
+
+
+    @property
+    def basis(self):
+        """
+        The basis vectors in Reduced Row Echelon Form
+        """
+        return [row[:] for row in self.rows]
+
+
+if __name__ == "__main__":
+    A = [[Fraction(1, 1), Fraction(1, 1), Fraction(1, 1), Fraction(1, 1)], [Fraction(2, 1), Fraction(1, 1), Fraction(4, 1), Fraction(3, 1)],
+            [Fraction(3, 1), Fraction(4, 1), Fraction(1, 1), Fraction(2, 1)]]
+    print(null_space(A, verbose=True))
 
+    tracker = IndependenceTracker(4)
+    for row in A:
+        print(row, "independent:", tracker.add(row))
+    print("rank:", tracker.rank)
@@ -0,0 +1,222 @@
+from fractions import Fraction
+
+
+"""
+Sparse Matrices and Sparse Gauss-Jordan Elimination
+
+Primary Use: RREF and Null Space of large Matrices that are mostly zeros
+
+A SparseMatrix stores every row as a dict {column index: NON-ZERO value}, plus the set of rows that have a
+NON-ZERO entry in each column. Elimination only visits the NON-ZERO entries:
+    1. Forward phase: for every column (left to right, so the pivot columns are the same as in the RREF),
+       pick the pivot among the remaining rows with a NON-ZERO entry in that column. Following Markowitz,
+       the row with the fewest NON-ZERO entries is chosen, because eliminating the column with it creates
+       the least fill-in (new NON-ZERO entries) in the other rows. For floats, only rows whose entry is at
+       least PIVOT_THRESHOLD times the largest entry of the column are candidates (threshold pivoting).
+    2. Backward phase: from the last pivot to the first, clear each pivot column in the pivot rows above.
+       At that point the pivot row is already reduced, so no fill is created in pivot columns.
+
+Ints and Fractions are eliminated exactly (ints become Fractions), floats use a tolerance below which
+entries are dropped.
+"""
+
+PIVOT_THRESHOLD = 0.1
+
+
+class SparseMatrix:
+    def __init__(self, m, n):
+        """
+        :param m: number of rows
+        :param n: number of columns
+        """
+        self.m = m
+        self.n = n
+        self.rows = [{} for _ in range(m)]  # row -> {column: NON-ZERO value}
+        self.col_rows = [set() for _ in range(n)]  # column -> rows with a NON-ZERO entry in it
+
+
+    @classmethod
+    def from_dense(cls, A):
+        """
+        Builds a SparseMatrix from a 2D array, keeping only the NON-ZERO entries
+        """
+        S = cls(len(A), len(A[0]) if A else 0)
+        for r, row in enumerate(A):
+            for c, val in enumerate(row):
+                if val != 0:
+                    S[r, c] = val
+        return S
+
+
+    @classmethod
+    def from_entries(cls, m, n, entries):
+        """
+        Builds an m x n SparseMatrix from (row, column, value) triples
+        """
+        S = cls(m, n)
+        for r, c, val in entries:
+            S[r, c] = val
+        return S
+
+
+    def to_dense(self):
+        """
+        Returns the Matrix as a 2D array (missing entries become 0)
+        """
+        dense = []
+        for row in self.rows:
+            dense_row = [0] * self.n
+            for c, val in row.items():
+                dense_row[c] = val
+            dense.append(dense_row)
+        return dense
+
+
+    def copy(self):
+        S = SparseMatrix(self.m, self.n)
+        S.rows = [dict(row) for row in self.rows]
+        S.col_rows = [set(rows) for rows in self.col_rows]
+        return S
+
+
+    def nnz(self):
+        """
+        Number of NON-ZERO entries
+        """
+        return sum(len(row) for row in self.rows)
+
+
+    def __getitem__(self, index):
+        r, c = index
+        return self.rows[r].get(c, 0)
+
+
+    def __setitem__(self, index, val):
+        r, c = index
+        if val != 0:
+            self.rows[r][c] = val
+            self.col_rows[c].add(r)
+        elif c in self.rows[r]:
+            del self.rows[r][c]
+            self.col_rows[c].discard(r)
+
+
+    def _subtract_scaled_row(self, r, top, factor, tol):
+        """
+        Row r minus factor times the row dict top, touching only the NON-ZERO entries of top
+        """
+        row = self.rows[r]
+        for c, top_val in top.items():
+            val = row.get(c, 0) - factor * top_val
+            if abs(val) <= tol:
+                if c in row:
+                    del row[c]
+                    self.col_rows[c].discard(r)
+            else:
+                if c not in row:
+                    self.col_rows[c].add(r)
+                row[c] = val
+
+
+    def __str__(self):
+        return "SparseMatrix(" + str(self.m) + " x " + str(self.n) + ", " + str(self.nnz()) + " non-zeros)"
+
+
+def _is_exact(S):
+    return all(isinstance(val, (int, Fraction)) for row in S.rows for val in row.values())
+
+
+def sparse_rref(A, tol=None):
+    """
+    Converts a Matrix into Reduced Row Echelon Form using sparse elimination
+
+    :param A: SparseMatrix or 2D array (m x n), not modified
+    :param tol: floats only, entries with absolute value <= tol are treated as 0
+                (defaults to 1e-12 times the largest absolute entry of A)
+    :return: (R, pivots) where R is a SparseMatrix in RREF (pivot rows first, in order of their pivot
+             column, then zero rows) and pivots the list of pivot column indices
+    """
+
+    S = A.copy() if isinstance(A, SparseMatrix) else SparseMatrix.from_dense(A)
+
+    exact = _is_exact(S)
+    if exact:
+        for row in S.rows:
+            for c in row:
+                row[c] = Fraction(row[c])
+        tol = 0
+    elif tol is None:
+        tol = 1e-12 * max((abs(val) for row in S.rows for val in row.values()), default=0)
+
+    active = set(range(S.m))  # rows that are not a pivot row yet
+    pivot_rows = []  # pivot_rows[k] is the row holding the k-th pivot
+
+    # forward phase
+    pivots = []
+    for col in range(S.n):
+        candidates = [r for r in S.col_rows[col] if r in active]
+        if not candidates:
+            continue
+
+        if not exact:
+            largest = max(abs(S.rows[r][col]) for r in candidates)
+            candidates = [r for r in candidates if abs(S.rows[r][col]) >= PIVOT_THRESHOLD * largest]
+        # Markowitz: fewest NON-ZERO entries first, row index to make the choice deterministic
+        pivot_row = min(candidates, key=lambda r: (len(S.rows[r]), r))
+
+        top = S.rows[pivot_row]
+        pivot = top[col]
+        for c in top:
+            top[c] = top[c] / pivot
+        top[col] = Fraction(1) if exact else 1.0
+
+        for r in list(S.col_rows[col]):
+            if r != pivot_row and r in active:
+                S._subtract_scaled_row(r, top, S.rows[r][col], tol)
+                S[r, col] = 0  # exactly 0, also for floats
+
+        active.discard(pivot_row)
+        pivots.append(col)
+        pivot_rows.append(pivot_row)
+
+    # backward phase
+    for k in range(len(pivots) - 1, -1, -1):
+        col, top = pivots[k], S.rows[pivot_rows[k]]
+        for r in list(S.col_rows[col]):
+            if r != pivot_rows[k]:
+                S._subtract_scaled_row(r, top, S.rows[r][col], tol)
+                S[r, col] = 0
+
+    # reorder the rows: pivot rows in pivot order, then the (now empty) remaining rows
+    R = SparseMatrix(S.m, S.n)
+    order = pivot_rows + sorted(active)
+    for new_r, old_r in enumerate(order):
+        for c, val in S.rows[old_r].items():
+            R[new_r, c] = val
+
+    return R, pivots
+
+
+def sparse_null_space(A, tol=None):
+    """
+    Basis of the Null Space of A from the pivot structure of sparse_rref
+
+    :param A: SparseMatrix or 2D array (m x n)
+    :param tol: see sparse_rref
+    :return: list of sparse vectors {column: value}, one per non-pivot column f, with x[f] = 1
+    """
+
+    R, pivots = sparse_rref(A, tol)
+    pivot_set = set(pivots)
+
+    basis = []
+    for free_col in range(R.n):
+        if free_col in pivot_set:
+            continue
+        vector = {free_col: 1}
+        # pivot row k has the entry R[k][free_col]; only those rows are visited
+        for k in R.col_rows[free_col]:
+            vector[pivots[k]] = -R.rows[k][free_col]
+        basis.append(vector)
+
+    return basis
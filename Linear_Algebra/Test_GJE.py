@@ -64,3 +64,48 @@ def test_get_top_row(ensure_2D, A, c_i, f_r, A_O):
 def test_rref(ensure_2D, A, A_O):
     assert rref(A) == A_O
 
+
+
+@pytest.mark.parametrize("A, A_O, pivots", [([[1, 1, 1, 1], [2, 1, 4, 3], [3, 4, 1, 2]], [[1, 0, 3, 2], [0, 1, -2, -1], [0, 0, 0, 0]], [0, 1]), ([[0, 2, 4], [0, 1, 3]], [[0, 1, 0], [0, 0, 1]], [1, 2])])
+def test_rref_numpy(ensure_2D, A, A_O, pivots):
+    np = pytest.importorskip("numpy")
+    R, P = rref(A, backend="numpy", return_pivots=True)
+    assert type(R) == list
+    assert np.allclose(R, A_O)
+    assert P == pivots
+
+
+def test_rref_numpy_random():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    # 150 x 120 matrix of rank 80
+    A = rng.standard_normal((150, 80)) @ rng.standard_normal((80, 120))
+    R, P = rref(A, backend="numpy", return_pivots=True, as_list=False)
+    assert len(P) == 80
+    assert np.allclose(R[:80, P], np.eye(80))
+    assert np.allclose(R[80:], 0)
+    # every column of A is the combination of the pivot columns given by R
+    assert np.allclose(A[:, P] @ R[:80], A)
+
+
+@pytest.mark.parametrize("A, A_O, pivots", [([[Fraction(1, 1), Fraction(1, 1), Fraction(1, 1), Fraction(1, 1)], [Fraction(2, 1), Fraction(1, 1), Fraction(4, 1), Fraction(3, 1)], [Fraction(3, 1), Fraction(4, 1), Fraction(1, 1), Fraction(2, 1)]], [[Fraction(1, 1), Fraction(0, 1), Fraction(3, 1), Fraction(2, 1)], [Fraction(0, 1), Fraction(1, 1), Fraction(-2, 1), Fraction(-1, 1)], [Fraction(0, 1), Fraction(0, 1), Fraction(0, 1), Fraction(0, 1)]], [0, 1]), ([[0, 2, 4, 2], [1, 0, Fraction(1, 2), 1]], [[1, 0, Fraction(1, 2), 1], [0, 1, 2, 1]], [0, 1])])
+def test_rref_exact(ensure_2D, A, A_O, pivots):
+    assert rref(A, exact=True, return_pivots=True) == (A_O, pivots)
+
+
+@pytest.mark.parametrize("A, d, r", [([[2, 0, 1], [1, 3, 2], [1, 1, 2]], 6, 3), ([[2, 0, 1], [1, 3, 2], [1, 1, 1]], 0, 2), ([[1, 2], [2, 4]], 0, 1), ([[0, 1], [1, 0]], -1, 2), ([[Fraction(1, 2), 1], [1, 3]], Fraction(1, 2), 2)])
+def test_det_rank(ensure_2D, A, d, r):
+    assert det(A) == d
+    assert rank(A) == r
+
+
+@pytest.mark.parametrize("block_size, workers", [(1, 1), (16, 1), (16, 3), (64, 2)])
+def test_rref_blocked(block_size, workers):
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(1)
+    # 130 x 110 matrix of rank 70
+    A = rng.standard_normal((130, 70)) @ rng.standard_normal((70, 110))
+    R, P = rref(A, backend="blocked", return_pivots=True, as_list=False, workers=workers, block_size=block_size)
+    R_O, P_O = rref(A, backend="numpy", return_pivots=True, as_list=False)
+    assert P == P_O
+    assert np.allclose(R, R_O)
@@ -0,0 +1,47 @@
+import pytest
+import random
+from fractions import Fraction
+from Guass_Jordan_Elimination import rref, det
+from LU_Factorization import *
+
+
+@pytest.mark.parametrize("A, b, x", [([[2, 1, 1], [4, -6, 0], [-2, 7, 2]], [5, -2, 9], [1, 1, 2]), ([[0, 1], [1, 0]], [3, 4], [4, 3]), ([[Fraction(1, 2), 1], [1, 1]], [1, 1], [0, 1])])
+def test_solve(A, b, x):
+    lu = LUFactorization(A)
+    assert lu.solve(b) == x
+    assert lu.det() == det(A)
+
+
+def test_factors():
+    A = [[0, 2, 1], [3, 1, 4], [6, 5, 2]]
+    lu = LUFactorization(A)
+    L, U = lu.L(), lu.U()
+    LU = [[sum(L[i][k] * U[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+    assert LU == [A[i] for i in lu.permutation]
+
+
+def test_solve_many():
+    rng = random.Random(0)
+    n, r = 8, 5
+    A = [[rng.randint(-9, 9) for _ in range(n)] for _ in range(n)]
+    B = [[rng.randint(-9, 9) for _ in range(r)] for _ in range(n)]
+    X = LUFactorization(A).solve_many(B)
+    # same as the last r columns of rref([A | B])
+    assert X == [row[n:] for row in rref([A[i] + B[i] for i in range(n)], exact=True)]
+
+
+def test_solve_many_float():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(1)
+    A = [[rng.uniform(-1, 1) for _ in range(30)] for _ in range(30)]
+    B = [[rng.uniform(-1, 1) for _ in range(10)] for _ in range(30)]
+    lu = LUFactorization(A)
+    X = lu.solve_many(B)
+    assert np.allclose(np.array(A) @ np.array(X), B)
+    assert np.allclose(lu.solve([row[3] for row in B]), [row[3] for row in X])
+
+
+@pytest.mark.parametrize("A", [[[1, 2], [2, 4]], [[1.0, 2.0], [2.0, 4.0]], [[0, 0], [0, 0]]])
+def test_singular(A):
+    with pytest.raises(ValueError):
+        LUFactorization(A)
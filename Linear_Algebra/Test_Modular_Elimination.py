@@ -0,0 +1,43 @@
+import pytest
+import random
+from fractions import Fraction
+from Guass_Jordan_Elimination import rref
+from Modular_Elimination import *
+
+
+@pytest.mark.parametrize("A, A_O", [([[Fraction(1, 1), Fraction(1, 1), Fraction(1, 1), Fraction(1, 1)], [Fraction(2, 1), Fraction(1, 1), Fraction(4, 1), Fraction(3, 1)], [Fraction(3, 1), Fraction(4, 1), Fraction(1, 1), Fraction(2, 1)]], [[Fraction(1, 1), Fraction(0, 1), Fraction(3, 1), Fraction(2, 1)], [Fraction(0, 1), Fraction(1, 1), Fraction(-2, 1), Fraction(-1, 1)], [Fraction(0, 1), Fraction(0, 1), Fraction(0, 1), Fraction(0, 1)]])])
+def test_rref_modular(A, A_O):
+    assert rref_modular(A) == A_O
+    assert rref_modular(A) == rref([row[:] for row in A])
+    assert rank_modular(A) == 2
+
+
+@pytest.mark.parametrize("A, p, O", [([[2, 4], [1, 3]], 7, [[1, 0], [0, 1]]), ([[2, 4], [1, 2]], 7, [[1, 2], [0, 0]]), ([[7, 1], [0, 1]], 7, [[0, 1], [0, 0]])])
+def test_rref_mod_p(A, p, O):
+    assert rref_mod_p(A, p)[0] == O
+
+
+@pytest.mark.parametrize("a, modulus, f", [(Fraction(-3, 7), 1000003, Fraction(-3, 7)), (Fraction(22, 5), 10**9 + 7, Fraction(22, 5))])
+def test_rational_reconstruction(a, modulus, f):
+    residue = a.numerator * pow(a.denominator, -1, modulus) % modulus
+    assert rational_reconstruction(residue, modulus) == f
+
+
+def test_unlucky_prime():
+    p = next(word_primes())
+    A = [[p, 1, 3], [p * p, 2, 5]]
+    assert rref_modular(A) == rref(A, exact=True)
+
+
+def test_random_rank_deficient():
+    rng = random.Random(0)
+    # 12 x 15 matrix of rank 7 with Fraction entries
+    B = [[rng.randint(-9, 9) for _ in range(7)] for _ in range(12)]
+    C = [[Fraction(rng.randint(-9, 9), rng.randint(1, 5)) for _ in range(15)] for _ in range(7)]
+    A = [[sum(B[i][k] * C[k][j] for k in range(7)) for j in range(15)] for i in range(12)]
+
+    assert rref_modular(A, return_pivots=True) == rref(A, exact=True, return_pivots=True)
+    basis = null_space_modular(A)
+    assert len(basis) == 15 - 7
+    for vector in basis:
+        assert all(sum(a * x for a, x in zip(row, vector)) == 0 for row in A)
@@ -0,0 +1,46 @@
+import pytest
+import random
+from fractions import Fraction
+from Guass_Jordan_Elimination import rref
+from Null_Space import *
+
+
+@pytest.mark.parametrize("A, N", [([[1, 1, 1, 1], [2, 1, 4, 3], [3, 4, 1, 2]], [[-3, 2, 1, 0], [-2, 1, 0, 1]]), ([[1, 0], [0, 1]], []), ([[0, 0, 0]], [[1, 0, 0], [0, 1, 0], [0, 0, 1]])])
+def test_null_space(A, N):
+    A_copy = [row[:] for row in A]
+    assert null_space(A) == N
+    assert A == A_copy
+
+
+def test_null_space_random():
+    rng = random.Random(0)
+    B = [[rng.randint(-5, 5) for _ in range(4)] for _ in range(6)]
+    C = [[Fraction(rng.randint(-5, 5), rng.randint(1, 4)) for _ in range(9)] for _ in range(4)]
+    A = [[sum(B[i][k] * C[k][j] for k in range(4)) for j in range(9)] for i in range(6)]
+
+    basis = null_space(A)
+    assert len(basis) == 9 - 4
+    for vector in basis:
+        assert all(sum(a * x for a, x in zip(row, vector)) == 0 for row in A)
+
+
+def test_independence_tracker():
+    rng = random.Random(1)
+    vectors = [[rng.randint(-3, 3) for _ in range(6)] for _ in range(4)]
+    vectors.insert(2, [a - 2 * b for a, b in zip(vectors[0], vectors[1])])
+    vectors += [[Fraction(1, 2) * a for a in vectors[3]]]
+
+    tracker = IndependenceTracker(6)
+    assert [tracker.add(v) for v in vectors] == [True, True, False, True, True, False]
+    assert tracker.rank == 4
+    # the basis is the RREF of all vectors added
+    assert tracker.basis == rref(vectors, exact=True)[:4]
+    assert not tracker.is_independent(vectors[2])
+
+
+def test_independence_tracker_float():
+    tracker = IndependenceTracker(3)
+    assert tracker.add([1.0, 2.0, 3.0])
+    assert tracker.add([0.1, 0.1, 0.1])
+    assert not tracker.add([0.3, 0.5, 0.7])
+    assert tracker.rank == 2
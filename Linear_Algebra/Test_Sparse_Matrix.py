@@ -0,0 +1,50 @@
+import pytest
+import random
+from fractions import Fraction
+from Guass_Jordan_Elimination import rref
+from Sparse_Matrix import *
+
+
+@pytest.mark.parametrize("A", [[[0, 0, 0], [1, 1, 1], [0, 0, 0]], [[1, 5, 1], [2, 11, 5]], [[1, 1, 1, 1], [2, 1, 4, 3], [3, 4, 1, 2]], [[0, 2, 0, 0], [0, 0, 0, 3], [1, 0, 0, 0]]])
+def test_sparse_rref(A):
+    S = SparseMatrix.from_dense(A)
+    assert S.to_dense() == A
+    R, pivots = sparse_rref(S)
+    assert (R.to_dense(), pivots) == rref(A, exact=True, return_pivots=True)
+    assert S.to_dense() == A
+
+
+def test_random_sparse():
+    rng = random.Random(0)
+    for _ in range(50):
+        m, n = rng.randint(1, 12), rng.randint(1, 12)
+        A = [[Fraction(rng.randint(-5, 5), rng.randint(1, 3)) if rng.random() < 0.25 else 0 for _ in range(n)] for _ in range(m)]
+        if m > 2:
+            A[-1] = [a - 2 * b for a, b in zip(A[0], A[1])]
+
+        R, pivots = sparse_rref(A)
+        assert (R.to_dense(), pivots) == rref(A, exact=True, return_pivots=True)
+
+        basis = sparse_null_space(A)
+        assert len(basis) == n - len(pivots)
+        for vector in basis:
+            assert all(sum(row[c] * x for c, x in vector.items()) == 0 for row in A)
+
+
+def test_sparse_rref_float():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(1)
+    A = [[rng.uniform(-1, 1) if rng.random() < 0.2 else 0.0 for _ in range(30)] for _ in range(25)]
+    R, pivots = sparse_rref(A)
+    R_O, pivots_O = rref(A, backend="numpy", return_pivots=True)
+    assert pivots == pivots_O
+    assert np.allclose(R.to_dense(), R_O)
+
+
+def test_banded():
+    # tridiagonal systems have no fill-in with the Markowitz pivot choice
+    n = 500
+    S = SparseMatrix.from_entries(n, n, [(i, j, 4 if i == j else -1) for i in range(n) for j in range(max(0, i - 1), min(n, i + 2))])
+    R, pivots = sparse_rref(S)
+    assert pivots == list(range(n))
+    assert R.nnz() == n